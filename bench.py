@@ -125,6 +125,31 @@ def benchmark(chardet_mod=chardet, verbose=False, num_iters=10):
     print(f"\nTotal time: {total_time}s ({calls_per_sec} calls per second)")
 
 
+def benchmark_small_inputs(chardet_mod=chardet, size=256, num_iters=10):
+    """
+    Compares the per-call overhead of ``detect`` with that of reusing one
+    ``Detector`` session, on the first ``size`` bytes of each test file.
+    """
+    print(f"\nPer-call time on inputs of at most {size} bytes")
+    print("-" * 80)
+    inputs = []
+    for full_path, _ in get_test_files():
+        with open(full_path, "rb") as f:
+            inputs.append(f.read(size))
+
+    candidates = [("detect", chardet_mod.detect)]
+    if hasattr(chardet_mod, "Detector"):
+        candidates.append(("Detector().detect", chardet_mod.Detector().detect))
+    for name, detect in candidates:
+        start = time.perf_counter()
+        for _ in range(num_iters):
+            for input_bytes in inputs:
+                detect(input_bytes)
+        bench_time = time.perf_counter() - start
+        per_call = bench_time / (num_iters * len(inputs))
+        print(f"{name}: {per_call * 1e6:.1f}us per call")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Times how long it takes to process each file in test set "
@@ -144,6 +169,13 @@ def main():
         type=int,
         default=10,
     )
+    parser.add_argument(
+        "-s",
+        "--small-inputs",
+        action="store_true",
+        help="Only measure the per-call overhead on small inputs, comparing "
+        "detect with a reused Detector session.",
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -156,11 +188,15 @@ def main():
         print("You must pip install cchardet if you want to benchmark it.")
         sys.exit(1)
 
-    benchmark(
-        chardet_mod=cchardet if args.cchardet else chardet,  # type: ignore
-        verbose=args.verbose,
-        num_iters=args.iterations,
-    )
+    chardet_mod = cchardet if args.cchardet else chardet  # type: ignore
+    if args.small_inputs:
+        benchmark_small_inputs(chardet_mod=chardet_mod, num_iters=args.iterations)
+    else:
+        benchmark(
+            chardet_mod=chardet_mod,
+            verbose=args.verbose,
+            num_iters=args.iterations,
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+"""
+Generate the binary versions of chardet's big lookup tables.
+
+The language models in ``chardet/lang*model.py`` and the frequency tables in
+``chardet/*freq.py`` (including the Japanese context table in
+``chardet/jpcntxfreq.py``) are the source of truth, but executing them is
+slow.  This script packs them into ``chardet/sbcsmodels.bin`` and ``chardet/freqtables.bin``
+and writes the small ``chardet/sbcsmodels.py`` and ``chardet/freqtables.py``
+modules that load them, which are what chardet actually imports.
+
+Rerun it whenever one of the source tables changes.
+"""
+
+import json
+import os
+import sys
+from argparse import ArgumentDefaultsHelpFormatter, ArgumentParser
+from array import array
+from importlib import import_module
+from itertools import chain
+from types import ModuleType
+from typing import Any, Dict, List
+
+# Always import the chardet next to this script, rather than an installed one
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from chardet import __version__  # noqa: E402
+from chardet.binarytables import BinaryTables  # noqa: E402
+from chardet.metadata.languages import LANGUAGES  # noqa: E402
+from chardet.sbcharsetprober import (  # noqa: E402
+    CompactSingleByteCharSetModel,
+    SingleByteCharSetModel,
+)
+
+FREQ_MODULES = ["big5freq", "euckrfreq", "euctwfreq", "gb2312freq", "jisfreq"]
+
+HEADER = """\
+######################## BEGIN LICENSE BLOCK ########################
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, see
+# <https://www.gnu.org/licenses/>.
+######################### END LICENSE BLOCK #########################
+\"\"\"
+{description}
+
+This file was generated by build_binary_tables.py from {sources}.
+Do not edit it by hand; edit those and rerun the script instead.
+\"\"\"
+
+"""
+
+
+def quote(text: str) -> str:
+    """Returns ``text`` as a double-quoted string literal, like ruff writes them."""
+    return json.dumps(text, ensure_ascii=False)
+
+
+def name_of(value: Any, module: ModuleType) -> str:
+    """Returns the name ``value`` is bound to at the top level of ``module``."""
+    for name, module_value in vars(module).items():
+        if module_value is value:
+            return name
+    raise ValueError(f"{module.__name__} has no top-level name for that table")
+
+
+def build_sbcs_models(output_dir: str) -> None:
+    tables: Dict[str, Any] = {}
+    lines: List[str] = []
+    sources: List[str] = []
+    for language in sorted(LANGUAGES):
+        module_name = f"lang{language.lower()}model"
+        try:
+            lang_mod = import_module(f"chardet.{module_name}")
+        except ImportError:
+            continue
+        sources.append(f"{module_name}.py")
+        for model_name, model in vars(lang_mod).items():
+            if not isinstance(model, SingleByteCharSetModel):
+                continue
+            compact = CompactSingleByteCharSetModel.from_model(model)
+            order_name = name_of(model.char_to_order_map, lang_mod)
+            lm_name = name_of(model.language_model, lang_mod)
+            tables[order_name] = compact.order_table
+            tables[lm_name] = compact.language_model
+            lines.append(
+                f"{model_name} = CompactSingleByteCharSetModel(\n"
+                f"    charset_name={quote(compact.charset_name)},\n"
+                f"    language={quote(compact.language)},\n"
+                f"    order_table=_TABLES.get_bytes({quote(order_name)}),\n"
+                f"    language_model=_TABLES.get_bytes({quote(lm_name)}),\n"
+                f"    typical_positive_ratio={compact.typical_positive_ratio!r},\n"
+                f"    keep_ascii_letters={compact.keep_ascii_letters!r},\n"
+                f"    alphabet={quote(compact.alphabet)},\n"
+                ")\n"
+            )
+
+    with open(os.path.join(output_dir, "sbcsmodels.bin"), "wb") as output_file:
+        output_file.write(BinaryTables.dump(tables))
+    with open(
+        os.path.join(output_dir, "sbcsmodels.py"), "w", encoding="utf-8"
+    ) as output_file:
+        output_file.write(
+            HEADER.format(
+                description="The single-byte language models, in their compact form.",
+                sources=", ".join(sources),
+            )
+        )
+        output_file.write(
+            "from .binarytables import BinaryTables\n"
+            "from .sbcharsetprober import CompactSingleByteCharSetModel\n\n"
+            '_TABLES = BinaryTables.load("sbcsmodels.bin")\n\n'
+        )
+        output_file.write("\n".join(lines))
+
+
+def build_freq_tables(output_dir: str) -> None:
+    tables: Dict[str, Any] = {}
+    lines: List[str] = []
+    sources: List[str] = []
+    for module_name in FREQ_MODULES:
+        freq_mod = import_module(f"chardet.{module_name}")
+        sources.append(f"{module_name}.py")
+        lines.append(f"# From {module_name}.py")
+        for name, value in vars(freq_mod).items():
+            if not name.isupper():
+                continue
+            if isinstance(value, tuple):
+                tables[name] = array("H", value)
+                lines.append(f"{name} = _TABLES.get_array({quote(name)})")
+            else:
+                lines.append(f"{name} = {value!r}")
+        lines.append("")
+
+    johab_mod = import_module("chardet.johabfreq")
+    sources.append("johabfreq.py")
+    johab_table = johab_mod.JOHAB_TO_EUCKR_ORDER_TABLE
+    tables["JOHAB_CODES"] = array("H", johab_table.keys())
+    tables["JOHAB_ORDERS"] = array("H", johab_table.values())
+    lines.append("# From johabfreq.py")
+    lines.append(
+        "JOHAB_TO_EUCKR_ORDER_TABLE = dict(\n"
+        '    zip(_TABLES.get_array("JOHAB_CODES"), _TABLES.get_array("JOHAB_ORDERS"))\n'
+        ")"
+    )
+
+    jpcntx_mod = import_module("chardet.jpcntxfreq")
+    sources.append("jpcntxfreq.py")
+    char_context = jpcntx_mod.JP2_CHAR_CONTEXT
+    tables["JP2_CHAR_CONTEXT"] = bytes(chain.from_iterable(char_context))
+    lines.append("")
+    lines.append("# From jpcntxfreq.py, one row after another")
+    lines.append(f"JP2_CHAR_CONTEXT_SIZE = {len(char_context)}")
+    lines.append('JP2_CHAR_CONTEXT = _TABLES.get_bytes("JP2_CHAR_CONTEXT")')
+
+    with open(os.path.join(output_dir, "freqtables.bin"), "wb") as output_file:
+        output_file.write(BinaryTables.dump(tables))
+    with open(
+        os.path.join(output_dir, "freqtables.py"), "w", encoding="utf-8"
+    ) as output_file:
+        output_file.write(
+            HEADER.format(
+                description=(
+                    "The character frequency tables used by chardistribution "
+                    "and jpcntx."
+                ),
+                sources=", ".join(sources),
+            )
+        )
+        output_file.write(
+            "from .binarytables import BinaryTables\n\n"
+            '_TABLES = BinaryTables.load("freqtables.bin")\n\n'
+        )
+        output_file.write("\n".join(lines) + "\n")
+
+
+def main() -> None:
+    parser = ArgumentParser(
+        description=__doc__, formatter_class=ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        help="Directory to write the generated files to.",
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "chardet"),
+    )
+    parser.add_argument("--version", action="version", version=__version__)
+    args = parser.parse_args()
+
+    build_sbcs_models(args.output_dir)
+    build_freq_tables(args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,51 +14,116 @@
 # <https://www.gnu.org/licenses/>.
 ######################### END LICENSE BLOCK #########################
 
-from typing import List, Union
+from importlib import import_module
+from mmap import mmap
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Union
 
-from .charsetgroupprober import CharSetGroupProber
-from .charsetprober import CharSetProber
-from .enums import InputState
 from .resultdict import ResultDict
 from .universaldetector import UniversalDetector
 from .version import VERSION, __version__
 
-__all__ = ["UniversalDetector", "detect", "detect_all", "__version__", "VERSION"]
+if TYPE_CHECKING:
+    from .aio import adetect_stream
+    from .batch import detect_files, detect_many
+    from .cache import ResultCache
+    from .detector import Detector, StrPath
+    from .sampling import SamplingPolicy
+
+__all__ = [
+    "Detector",
+    "ResultCache",
+    "adetect_stream",
+    "UniversalDetector",
+    "detect",
+    "detect_all",
+    "detect_file",
+    "detect_files",
+    "detect_many",
+    "__version__",
+    "VERSION",
+]
+
+# The modules that the rest of the public names come from.  They are only
+# imported once one of those names is used, so that import chardet does not
+# load concurrent.futures, threading and hashlib for everyone.
+_LAZY_NAMES = {
+    "adetect_stream": "aio",
+    "detect_files": "batch",
+    "detect_many": "batch",
+    "ResultCache": "cache",
+    "Detector": "detector",
+    "SamplingPolicy": "sampling",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *_LAZY_NAMES})
 
 
 def detect(
-    byte_str: Union[bytes, bytearray], should_rename_legacy: bool = False
+    byte_str: Union[bytes, bytearray, memoryview, mmap],
+    should_rename_legacy: bool = False,
+    sampling: Optional["SamplingPolicy"] = None,
+    cache: Optional["ResultCache"] = None,
+    encodings: Optional[Iterable[str]] = None,
+    exclude_encodings: Optional[Iterable[str]] = None,
 ) -> ResultDict:
     """
     Detect the encoding of the given byte string.
 
+    To detect the encodings of many documents, a ``Detector`` is faster.
+
     :param byte_str:     The byte sequence to examine.
-    :type byte_str:      ``bytes`` or ``bytearray``
+    :type byte_str:      ``bytes``, ``bytearray``, ``memoryview`` or ``mmap``
     :param should_rename_legacy:  Should we rename legacy encodings
                                   to their more modern equivalents?
     :type should_rename_legacy:   ``bool``
+    :param sampling:     Only look at the parts of ``byte_str`` that this
+                         picks, rather than all of it.
+    :type sampling:      ``chardet.sampling.SamplingPolicy``
+    :param cache:        Look the result up in this cache first, and add it
+                         if it is not there.
+    :type cache:         ``chardet.cache.ResultCache``
+    :param encodings:    Only consider these encodings.
+    :type encodings:     iterable of ``str``
+    :param exclude_encodings:  Never consider these encodings.
+    :type exclude_encodings:   iterable of ``str``
     """
-    if not isinstance(byte_str, bytearray):
-        if not isinstance(byte_str, bytes):
-            raise TypeError(
-                f"Expected object of type bytes or bytearray, got: {type(byte_str)}"
-            )
-        byte_str = bytearray(byte_str)
-    detector = UniversalDetector(should_rename_legacy=should_rename_legacy)
-    detector.feed(byte_str)
-    return detector.close()
+    from .detector import Detector
+
+    return Detector(
+        should_rename_legacy=should_rename_legacy,
+        encodings=encodings,
+        exclude_encodings=exclude_encodings,
+    ).detect(byte_str, sampling=sampling, cache=cache)
 
 
 def detect_all(
-    byte_str: Union[bytes, bytearray],
+    byte_str: Union[bytes, bytearray, memoryview, mmap],
     ignore_threshold: bool = False,
     should_rename_legacy: bool = False,
+    sampling: Optional["SamplingPolicy"] = None,
+    cache: Optional["ResultCache"] = None,
+    encodings: Optional[Iterable[str]] = None,
+    exclude_encodings: Optional[Iterable[str]] = None,
 ) -> List[ResultDict]:
     """
     Detect all the possible encodings of the given byte string.
 
+    To detect the encodings of many documents, a ``Detector`` is faster.
+
     :param byte_str:          The byte sequence to examine.
-    :type byte_str:           ``bytes`` or ``bytearray``
+    :type byte_str:           ``bytes``, ``bytearray``, ``memoryview`` or
+                              ``mmap``
     :param ignore_threshold:  Include encodings that are below
                               ``UniversalDetector.MINIMUM_THRESHOLD``
                               in results.
@@ -66,47 +131,55 @@ def detect_all(
     :param should_rename_legacy:  Should we rename legacy encodings
                                   to their more modern equivalents?
     :type should_rename_legacy:   ``bool``
+    :param sampling:          Only look at the parts of ``byte_str`` that
+                              this picks, rather than all of it.
+    :type sampling:           ``chardet.sampling.SamplingPolicy``
+    :param cache:             Look the results up in this cache first, and add
+                              them if they are not there.
+    :type cache:              ``chardet.cache.ResultCache``
+    :param encodings:         Only consider these encodings.
+    :type encodings:          iterable of ``str``
+    :param exclude_encodings: Never consider these encodings.
+    :type exclude_encodings:  iterable of ``str``
+    """
+    from .detector import Detector
+
+    return Detector(
+        should_rename_legacy=should_rename_legacy,
+        encodings=encodings,
+        exclude_encodings=exclude_encodings,
+    ).detect_all(
+        byte_str, ignore_threshold=ignore_threshold, sampling=sampling, cache=cache
+    )
+
+
+def detect_file(
+    path: "StrPath",
+    should_rename_legacy: bool = False,
+    sampling: Optional["SamplingPolicy"] = None,
+    encodings: Optional[Iterable[str]] = None,
+    exclude_encodings: Optional[Iterable[str]] = None,
+) -> ResultDict:
+    """
+    Detect the encoding of a file, reading only as much of it as is needed.
+
+    :param path:         The path of the file to examine.
+    :type path:          ``str`` or ``os.PathLike``
+    :param should_rename_legacy:  Should we rename legacy encodings
+                                  to their more modern equivalents?
+    :type should_rename_legacy:   ``bool``
+    :param sampling:     Only read the parts of the file that this picks,
+                         rather than all of it.
+    :type sampling:      ``chardet.sampling.SamplingPolicy``
+    :param encodings:    Only consider these encodings.
+    :type encodings:     iterable of ``str``
+    :param exclude_encodings:  Never consider these encodings.
+    :type exclude_encodings:   iterable of ``str``
     """
-    if not isinstance(byte_str, bytearray):
-        if not isinstance(byte_str, bytes):
-            raise TypeError(
-                f"Expected object of type bytes or bytearray, got: {type(byte_str)}"
-            )
-        byte_str = bytearray(byte_str)
-
-    detector = UniversalDetector(should_rename_legacy=should_rename_legacy)
-    detector.feed(byte_str)
-    detector.close()
-
-    if detector.input_state == InputState.HIGH_BYTE:
-        results: List[ResultDict] = []
-        probers: List[CharSetProber] = []
-        for prober in detector.charset_probers:
-            if isinstance(prober, CharSetGroupProber):
-                probers.extend(p for p in prober.probers)
-            else:
-                probers.append(prober)
-        for prober in probers:
-            if ignore_threshold or prober.get_confidence() > detector.MINIMUM_THRESHOLD:
-                charset_name = prober.charset_name or ""
-                lower_charset_name = charset_name.lower()
-                # Use Windows encoding name instead of ISO-8859 if we saw any
-                # extra Windows-specific bytes
-                if lower_charset_name.startswith("iso-8859") and detector.has_win_bytes:
-                    charset_name = detector.ISO_WIN_MAP.get(
-                        lower_charset_name, charset_name
-                    )
-                # Rename legacy encodings with superset encodings if asked
-                if should_rename_legacy:
-                    charset_name = detector.LEGACY_MAP.get(
-                        charset_name.lower(), charset_name
-                    )
-                results.append({
-                    "encoding": charset_name,
-                    "confidence": prober.get_confidence(),
-                    "language": prober.language,
-                })
-        if len(results) > 0:
-            return sorted(results, key=lambda result: -result["confidence"])
-
-    return [detector.result]
+    from .detector import Detector
+
+    return Detector(
+        should_rename_legacy=should_rename_legacy,
+        encodings=encodings,
+        exclude_encodings=exclude_encodings,
+    ).detect_file(path, sampling=sampling)
@@ -0,0 +1,111 @@
+######################## BEGIN LICENSE BLOCK ########################
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, see
+# <https://www.gnu.org/licenses/>.
+######################### END LICENSE BLOCK #########################
+"""
+Detecting encodings from inside an asyncio event loop.
+
+``asyncio`` is only imported once one of these coroutines runs (at which point
+it has been imported already), so that importing chardet stays cheap for
+everyone else.
+"""
+
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, AsyncIterable, Iterable, Optional, Union
+
+from .resultdict import ResultDict
+from .universaldetector import UniversalDetector, as_byte_view
+
+if TYPE_CHECKING:
+    from asyncio import StreamReader
+
+
+async def adetect_stream(
+    stream: Union["StreamReader", AsyncIterable[bytes]],
+    should_rename_legacy: bool = False,
+    slice_size: int = 4096,
+    read_size: int = 64 * 1024,
+    offload: bool = False,
+    executor: Optional[Executor] = None,
+    encodings: Optional[Iterable[str]] = None,
+    exclude_encodings: Optional[Iterable[str]] = None,
+) -> ResultDict:
+    """
+    Detect the encoding of a stream of bytes without blocking the event loop.
+
+    The stream is read chunk by chunk, and each chunk is fed to a
+    ``UniversalDetector`` in slices of at most ``slice_size`` bytes, handing
+    control back to the event loop in between.  Reading stops as soon as the
+    detector has made up its mind, so the rest of the stream is left unread.
+
+    :param stream:        An ``asyncio.StreamReader``, or any asynchronous
+                          iterable of byte strings (such as the body of an
+                          HTTP response).
+    :param should_rename_legacy:  Should we rename legacy encodings
+                                  to their more modern equivalents?
+    :type should_rename_legacy:   ``bool``
+    :param slice_size:    The most bytes to feed the detector in one go.
+    :type slice_size:     ``int``
+    :param read_size:     How many bytes to ask a ``StreamReader`` for at a
+                          time.
+    :type read_size:      ``int``
+    :param offload:       Feed the slices to the detector in ``executor``
+                          instead of in the event loop's thread.
+    :type offload:        ``bool``
+    :param executor:      The executor to use with ``offload``.  It has to
+                          run the slices in this process, so it should be a
+                          ``ThreadPoolExecutor``.  Defaults to the event loop's
+                          default executor.
+    :type executor:       ``concurrent.futures.Executor``
+    :param encodings:     Only consider these encodings.
+    :type encodings:      iterable of ``str``
+    :param exclude_encodings:  Never consider these encodings.
+    :type exclude_encodings:   iterable of ``str``
+    """
+    import asyncio
+
+    if slice_size < 1:
+        raise ValueError("slice_size must be at least 1")
+    loop = asyncio.get_running_loop()
+    detector = UniversalDetector(
+        should_rename_legacy=should_rename_legacy,
+        encodings=encodings,
+        exclude_encodings=exclude_encodings,
+    )
+
+    async def feed(chunk: bytes) -> None:
+        view = as_byte_view(chunk)
+        for start in range(0, len(view), slice_size):
+            byte_slice = view[start : start + slice_size]
+            if offload:
+                await loop.run_in_executor(executor, detector.feed, byte_slice)
+            else:
+                detector.feed(byte_slice)
+                await asyncio.sleep(0)
+            if detector.done:
+                return
+
+    if isinstance(stream, asyncio.StreamReader):
+        while not detector.done:
+            chunk = await stream.read(read_size)
+            if not chunk:
+                break
+            await feed(chunk)
+    else:
+        async for chunk in stream:
+            await feed(chunk)
+            if detector.done:
+                break
+
+    return detector.close()
@@ -0,0 +1,318 @@
+######################## BEGIN LICENSE BLOCK ########################
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, see
+# <https://www.gnu.org/licenses/>.
+######################### END LICENSE BLOCK #########################
+"""
+Detecting the encodings of many documents at once, spread over several
+processes.
+
+The probers are pure Python and CPU-bound, so threads do not help, but a
+process pool does.  Each worker process keeps one warm ``Detector`` that it
+reuses for every document it is handed.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from functools import partial
+from itertools import islice
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from .detector import Detector, StrPath
+from .resultdict import ResultDict
+from .sampling import SamplingPolicy
+
+T = TypeVar("T")
+
+# The Detector that each worker process reuses, set up by _init_worker.  Only
+# worker processes use it; detecting in this process uses a Detector of its own.
+_WORKER_DETECTOR: Optional[Detector] = None
+
+
+# The arguments _init_worker is called with
+WorkerArgs = Tuple[bool, Optional[FrozenSet[str]], Optional[FrozenSet[str]]]
+
+# Detects the encodings of a batch of items, with the given Detector or, if it
+# is None, the one for this worker process
+BatchFunction = Callable[[List[T], Optional[Detector]], List[ResultDict]]
+
+
+def _init_worker(
+    should_rename_legacy: bool,
+    encodings: Optional[FrozenSet[str]] = None,
+    exclude_encodings: Optional[FrozenSet[str]] = None,
+) -> None:
+    global _WORKER_DETECTOR
+    _WORKER_DETECTOR = Detector(
+        should_rename_legacy=should_rename_legacy,
+        encodings=encodings,
+        exclude_encodings=exclude_encodings,
+    )
+    # Create all of the probers and load their tables up front, so that the
+    # first real document does not pay for it.
+    _WORKER_DETECTOR.detect(b"\xe9")
+
+
+def _get_worker_detector() -> Detector:
+    if _WORKER_DETECTOR is None:
+        _init_worker(False)
+    assert _WORKER_DETECTOR is not None
+    return _WORKER_DETECTOR
+
+
+def _detect_byte_strs(
+    byte_strs: List[Union[bytes, bytearray, memoryview]],
+    detector: Optional[Detector] = None,
+    sampling: Optional[SamplingPolicy] = None,
+) -> List[ResultDict]:
+    if detector is None:
+        detector = _get_worker_detector()
+    return [detector.detect(byte_str, sampling=sampling) for byte_str in byte_strs]
+
+
+def _detect_paths(
+    paths: List[StrPath],
+    detector: Optional[Detector] = None,
+    sampling: Optional[SamplingPolicy] = None,
+) -> List[ResultDict]:
+    if detector is None:
+        detector = _get_worker_detector()
+    return [detector.detect_file(path, sampling=sampling) for path in paths]
+
+
+def _worker_args(
+    should_rename_legacy: bool,
+    encodings: Optional[Iterable[str]],
+    exclude_encodings: Optional[Iterable[str]],
+) -> WorkerArgs:
+    # Any iterable will do for the encodings, but they have to be pickled
+    return (
+        should_rename_legacy,
+        None if encodings is None else frozenset(encodings),
+        None if exclude_encodings is None else frozenset(exclude_encodings),
+    )
+
+
+def _run_batches(
+    items: Iterable[T],
+    detect_batch: BatchFunction[T],
+    workers: Optional[int],
+    ordered: bool,
+    chunksize: int,
+    worker_args: WorkerArgs,
+) -> Iterator[Tuple[int, T, ResultDict]]:
+    """
+    Runs ``detect_batch`` over ``items`` in batches of ``chunksize``, and
+    returns an iterator over the index of each item, the item itself and its
+    result.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    item_iter = iter(items)
+    batches = iter(lambda: list(islice(item_iter, chunksize)), [])
+    if workers == 1:
+        # Not worth starting another process for
+        return _iter_local_results(batches, detect_batch, worker_args)
+    return _iter_pool_results(batches, detect_batch, workers, ordered, worker_args)
+
+
+def _iter_local_results(
+    batches: Iterator[List[T]],
+    detect_batch: BatchFunction[T],
+    worker_args: WorkerArgs,
+) -> Iterator[Tuple[int, T, ResultDict]]:
+    # Not the worker process Detector, so that generators that run at the same
+    # time (or in different threads) do not share one
+    should_rename_legacy, encodings, exclude_encodings = worker_args
+    detector = Detector(
+        should_rename_legacy=should_rename_legacy,
+        encodings=encodings,
+        exclude_encodings=exclude_encodings,
+    )
+    index = 0
+    for batch in batches:
+        for item, result in zip(batch, detect_batch(batch, detector)):
+            yield index, item, result
+            index += 1
+
+
+def _iter_pool_results(
+    batches: Iterator[List[T]],
+    detect_batch: BatchFunction[T],
+    workers: int,
+    ordered: bool,
+    worker_args: WorkerArgs,
+) -> Iterator[Tuple[int, T, ResultDict]]:
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Only a few batches per worker are in flight at a time, so that huge (or
+    # endless) inputs are not read into memory all at once.
+    max_pending = 2 * workers
+    # The index of the first item of each batch that is in flight, and the
+    # batch itself, keyed by its future.
+    pending: Dict["Future[List[ResultDict]]", Tuple[int, List[T]]] = {}
+    # The same futures, in the order they were submitted, if that matters
+    queue: Deque["Future[List[ResultDict]]"] = deque()
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=worker_args,
+    )
+    try:
+        start = 0
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                batch = next(batches, None)
+                if batch is None:
+                    exhausted = True
+                    break
+                future = executor.submit(detect_batch, batch, None)
+                pending[future] = (start, batch)
+                if ordered:
+                    queue.append(future)
+                start += len(batch)
+            if not pending:
+                break
+            if ordered:
+                done = [queue.popleft()]
+            else:
+                done = wait(pending, return_when=FIRST_COMPLETED).done
+            for future in done:
+                first_index, batch = pending.pop(future)
+                for offset, result in enumerate(future.result()):
+                    yield first_index + offset, batch[offset], result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def detect_many(
+    byte_strs: Iterable[Union[bytes, bytearray, memoryview]],
+    workers: Optional[int] = None,
+    ordered: bool = True,
+    chunksize: int = 16,
+    should_rename_legacy: bool = False,
+    sampling: Optional[SamplingPolicy] = None,
+    encodings: Optional[Iterable[str]] = None,
+    exclude_encodings: Optional[Iterable[str]] = None,
+) -> Iterator[Tuple[int, ResultDict]]:
+    """
+    Detect the encodings of many byte strings, using a pool of worker
+    processes.
+
+    Results are yielded as they become available, as ``(index, result)``
+    pairs, where ``index`` is the position of the byte string in
+    ``byte_strs``.  The byte strings have to be sent to the workers, so for
+    documents that are stored in files, ``detect_files`` is cheaper.
+
+    :param byte_strs:    The byte sequences to examine.
+    :type byte_strs:     iterable of ``bytes``, ``bytearray`` or ``memoryview``
+    :param workers:      How many worker processes to use.  Defaults to the
+                         number of CPUs.  With ``1``, everything is done in
+                         this process.
+    :type workers:       ``int``
+    :param ordered:      Yield the results in the same order as ``byte_strs``,
+                         rather than as soon as they are ready.
+    :type ordered:       ``bool``
+    :param chunksize:    How many byte strings to send to a worker at a time.
+    :type chunksize:     ``int``
+    :param should_rename_legacy:  Should we rename legacy encodings
+                                  to their more modern equivalents?
+    :type should_rename_legacy:   ``bool``
+    :param sampling:     Only look at the parts of each document that this
+                         picks, rather than all of it.
+    :type sampling:      ``chardet.sampling.SamplingPolicy``
+    :param encodings:    Only consider these encodings.
+    :type encodings:     iterable of ``str``
+    :param exclude_encodings:  Never consider these encodings.
+    :type exclude_encodings:   iterable of ``str``
+    """
+    results = _run_batches(
+        # memoryviews cannot be pickled
+        (
+            byte_str.tobytes() if isinstance(byte_str, memoryview) else byte_str
+            for byte_str in byte_strs
+        ),
+        partial(_detect_byte_strs, sampling=sampling),
+        workers,
+        ordered,
+        chunksize,
+        _worker_args(should_rename_legacy, encodings, exclude_encodings),
+    )
+    return ((index, result) for index, _, result in results)
+
+
+def detect_files(
+    paths: Iterable[StrPath],
+    workers: Optional[int] = None,
+    ordered: bool = True,
+    chunksize: int = 16,
+    should_rename_legacy: bool = False,
+    sampling: Optional[SamplingPolicy] = None,
+    encodings: Optional[Iterable[str]] = None,
+    exclude_encodings: Optional[Iterable[str]] = None,
+) -> Iterator[Tuple[StrPath, ResultDict]]:
+    """
+    Detect the encodings of many files, using a pool of worker processes.
+
+    Only the paths are sent to the workers, which read the files themselves.
+    Results are yielded as they become available, as ``(path, result)`` pairs.
+
+    :param paths:        The paths of the files to examine.
+    :type paths:         iterable of ``str`` or ``os.PathLike``
+    :param workers:      How many worker processes to use.  Defaults to the
+                         number of CPUs.  With ``1``, everything is done in
+                         this process.
+    :type workers:       ``int``
+    :param ordered:      Yield the results in the same order as ``paths``,
+                         rather than as soon as they are ready.
+    :type ordered:       ``bool``
+    :param chunksize:    How many paths to send to a worker at a time.
+    :type chunksize:     ``int``
+    :param should_rename_legacy:  Should we rename legacy encodings
+                                  to their more modern equivalents?
+    :type should_rename_legacy:   ``bool``
+    :param sampling:     Only look at the parts of each document that this
+                         picks, rather than all of it.
+    :type sampling:      ``chardet.sampling.SamplingPolicy``
+    :param encodings:    Only consider these encodings.
+    :type encodings:     iterable of ``str``
+    :param exclude_encodings:  Never consider these encodings.
+    :type exclude_encodings:   iterable of ``str``
+    """
+    results = _run_batches(
+        paths,
+        partial(_detect_paths, sampling=sampling),
+        workers,
+        ordered,
+        chunksize,
+        _worker_args(should_rename_legacy, encodings, exclude_encodings),
+    )
+    return ((path, result) for _, path, result in results)
@@ -0,0 +1,112 @@
+######################## BEGIN LICENSE BLOCK ########################
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, see
+# <https://www.gnu.org/licenses/>.
+######################### END LICENSE BLOCK #########################
+"""
+Reading and writing the binary files that hold chardet's big lookup tables.
+
+Loading a table from one of these files is much faster, and takes much less
+memory, than executing the equivalent Python literal.  The files are generated
+by ``build_binary_tables.py`` in the root of the repository.
+
+A file starts with ``MAGIC``, followed by any number of tables, each of which
+is stored as:
+
+* the length of the table's name (1 byte), followed by the name in ASCII
+* the ``array`` type code of the table (1 byte, either ``B`` or ``H``)
+* the number of items in the table (4 bytes, little-endian)
+* the items themselves, little-endian
+"""
+
+import pkgutil
+import struct
+import sys
+from array import array
+from typing import Dict, Union
+
+MAGIC = b"chardet tables\x00\x01"
+HEADER = struct.Struct("<cI")
+
+
+class BinaryTables:
+    """
+    The tables in a binary table file, by name.  ``B`` tables are returned as
+    ``bytes``, and ``H`` tables as ``array`` objects.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        if not data.startswith(MAGIC):
+            raise ValueError("Not a chardet binary table file")
+        self._tables: Dict[str, Union[bytes, "array[int]"]] = {}
+        view = memoryview(data)
+        pos = len(MAGIC)
+        while pos < len(data):
+            name_len = data[pos]
+            pos += 1
+            name = data[pos : pos + name_len].decode("ascii")
+            pos += name_len
+            type_code, length = HEADER.unpack_from(data, pos)
+            pos += HEADER.size
+            if type_code == b"B":
+                self._tables[name] = data[pos : pos + length]
+                pos += length
+            elif type_code == b"H":
+                table = array("H")
+                table.frombytes(view[pos : pos + 2 * length])
+                if sys.byteorder != "little":
+                    table.byteswap()
+                self._tables[name] = table
+                pos += 2 * length
+            else:
+                raise ValueError(f"Unknown type code {type_code!r} for table {name}")
+
+    @classmethod
+    def load(cls, file_name: str) -> "BinaryTables":
+        """Loads a binary table file that is shipped with chardet."""
+        data = pkgutil.get_data(__package__ or "chardet", file_name)
+        if data is None:
+            raise FileNotFoundError(file_name)
+        return cls(data)
+
+    @staticmethod
+    def dump(tables: Dict[str, Union[bytes, "array[int]"]]) -> bytes:
+        """Returns the contents of a binary table file holding ``tables``."""
+        chunks = [MAGIC]
+        for name, table in tables.items():
+            encoded_name = name.encode("ascii")
+            chunks.append(bytes([len(encoded_name)]) + encoded_name)
+            if isinstance(table, array):
+                if table.typecode != "H":
+                    raise ValueError(f"Unsupported type code for table {name}")
+                table = array("H", table)
+                if sys.byteorder != "little":
+                    table.byteswap()
+                chunks.append(HEADER.pack(b"H", len(table)))
+                chunks.append(table.tobytes())
+            else:
+                chunks.append(HEADER.pack(b"B", len(table)))
+                chunks.append(bytes(table))
+        return b"".join(chunks)
+
+    def get_bytes(self, name: str) -> bytes:
+        table = self._tables[name]
+        if not isinstance(table, bytes):
+            raise TypeError(f"Table {name} is not a byte table")
+        return table
+
+    def get_array(self, name: str) -> "array[int]":
+        table = self._tables[name]
+        if not isinstance(table, array):
+            raise TypeError(f"Table {name} is not an array table")
+        return table
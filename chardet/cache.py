@@ -0,0 +1,152 @@
+######################## BEGIN LICENSE BLOCK ########################
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, see
+# <https://www.gnu.org/licenses/>.
+######################### END LICENSE BLOCK #########################
+"""
+A cache of detection results, for callers that see the same documents over
+and over again.
+"""
+
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
+from typing import (
+    Callable,
+    Hashable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+    overload,
+)
+
+from .resultdict import ResultDict
+from .sampling import SamplingPolicy
+
+# What detect and detect_all return
+CachedResult = Union[ResultDict, List[ResultDict]]
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class ResultCache:
+    """
+    A thread-safe cache of detection results, which throws away the least
+    recently used result once it holds ``maxsize`` of them.
+
+    Results are keyed by a hash of the bytes that detection would look at
+    (only the sampled parts, if a sampling policy is used), together with the
+    options that affect the result, so a repeated document costs one hash
+    rather than a full run of the probers.  Pass one as the ``cache`` argument
+    of ``chardet.detect``, ``chardet.detect_all`` or a ``Detector``:
+
+    .. code::
+
+            cache = ResultCache(maxsize=4096)
+            for document in documents:
+                print(chardet.detect(document, cache=cache))
+            print(cache.cache_info())
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._results: "OrderedDict[Hashable, CachedResult]" = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(
+        byte_view: memoryview,
+        sampling: Optional[SamplingPolicy],
+        options: Tuple[Hashable, ...],
+    ) -> Hashable:
+        """
+        Returns the key for the result of looking at ``byte_view`` with
+        ``sampling`` and ``options``.
+        """
+        digest = blake2b(digest_size=16)
+        if sampling is None:
+            digest.update(byte_view)
+        else:
+            for start, end in sampling.ranges(len(byte_view)):
+                digest.update(byte_view[start:end])
+        return (digest.digest(), len(byte_view), sampling, options)
+
+    @overload
+    def get_or_detect(
+        self, key: Hashable, detect: Callable[[], ResultDict]
+    ) -> ResultDict: ...
+
+    @overload
+    def get_or_detect(
+        self, key: Hashable, detect: Callable[[], List[ResultDict]]
+    ) -> List[ResultDict]: ...
+
+    def get_or_detect(
+        self, key: Hashable, detect: Callable[[], CachedResult]
+    ) -> CachedResult:
+        """
+        Returns the result cached under ``key``, calling ``detect`` to get
+        it if there is none.  Every call returns a fresh copy of the result,
+        so callers are free to change it.
+        """
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                self._hits += 1
+        if result is None:
+            # Detection runs outside of the lock, so that other threads are
+            # not held up by it.  If two of them miss on the same key at
+            # once, both run it, and the second result just replaces the
+            # first.
+            result = detect()
+            with self._lock:
+                self._misses += 1
+                self._results[key] = result
+                self._results.move_to_end(key)
+                if len(self._results) > self.maxsize:
+                    self._results.popitem(last=False)
+        return self._copy(result)
+
+    @staticmethod
+    def _copy(result: CachedResult) -> CachedResult:
+        if isinstance(result, list):
+            return [ResultDict(**r) for r in result]
+        return ResultDict(**result)
+
+    def cache_info(self) -> CacheInfo:
+        """Returns the number of hits and misses so far, and the cache size."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._results))
+
+    def clear(self) -> None:
+        """Empties the cache and resets its statistics."""
+        with self._lock:
+            self._results.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._results)
@@ -24,36 +24,13 @@
 # <https://www.gnu.org/licenses/>.
 ######################### END LICENSE BLOCK #########################
 
-from typing import Tuple, Union
-
-from .big5freq import (
-    BIG5_CHAR_TO_FREQ_ORDER,
-    BIG5_TABLE_SIZE,
-    BIG5_TYPICAL_DISTRIBUTION_RATIO,
-)
-from .euckrfreq import (
-    EUCKR_CHAR_TO_FREQ_ORDER,
-    EUCKR_TABLE_SIZE,
-    EUCKR_TYPICAL_DISTRIBUTION_RATIO,
-)
-from .euctwfreq import (
-    EUCTW_CHAR_TO_FREQ_ORDER,
-    EUCTW_TABLE_SIZE,
-    EUCTW_TYPICAL_DISTRIBUTION_RATIO,
-)
-from .gb2312freq import (
-    GB2312_CHAR_TO_FREQ_ORDER,
-    GB2312_TABLE_SIZE,
-    GB2312_TYPICAL_DISTRIBUTION_RATIO,
-)
-from .jisfreq import (
-    JIS_CHAR_TO_FREQ_ORDER,
-    JIS_TABLE_SIZE,
-    JIS_TYPICAL_DISTRIBUTION_RATIO,
-)
-from .johabfreq import JOHAB_TO_EUCKR_ORDER_TABLE
+from typing import Sequence, Union
 
 
+# The frequency tables are big, so subclasses only import the one they need when
+# they are first instantiated, rather than when this module is imported.  They
+# come from freqtables, which build_binary_tables.py generates from the *freq
+# modules and which loads much faster than they do.
 class CharDistributionAnalysis:
     ENOUGH_DATA_THRESHOLD = 1024
     SURE_YES = 0.99
@@ -63,7 +40,7 @@ class CharDistributionAnalysis:
     def __init__(self) -> None:
         # Mapping table to get frequency order from char order (get from
         # GetOrder())
-        self._char_to_freq_order: Tuple[int, ...] = tuple()
+        self._char_to_freq_order: Sequence[int] = ()
         self._table_size = 0  # Size of above table
         # This is a constant value which varies from language to language,
         # used in calculating confidence.  See
@@ -84,7 +61,7 @@ class CharDistributionAnalysis:
         # The number of characters whose frequency order is less than 512
         self._freq_chars = 0
 
-    def feed(self, char: Union[bytes, bytearray], char_len: int) -> None:
+    def feed(self, char: Union[bytes, bytearray, memoryview], char_len: int) -> None:
         """feed a character with known length"""
         if char_len == 2:
             # we only care about 2-bytes character in our distribution analysis
@@ -120,7 +97,7 @@ class CharDistributionAnalysis:
         # For charset detection, certain amount of data is enough
         return self._total_chars > self.ENOUGH_DATA_THRESHOLD
 
-    def get_order(self, _: Union[bytes, bytearray]) -> int:
+    def get_order(self, _: Union[bytes, bytearray, memoryview]) -> int:
         # We do not handle characters based on the original encoding string,
         # but convert this encoding string to a number, here called order.
         # This allows multiple encodings of a language to share one frequency
@@ -130,12 +107,18 @@ class CharDistributionAnalysis:
 
 class EUCTWDistributionAnalysis(CharDistributionAnalysis):
     def __init__(self) -> None:
+        from .freqtables import (
+            EUCTW_CHAR_TO_FREQ_ORDER,
+            EUCTW_TABLE_SIZE,
+            EUCTW_TYPICAL_DISTRIBUTION_RATIO,
+        )
+
         super().__init__()
         self._char_to_freq_order = EUCTW_CHAR_TO_FREQ_ORDER
         self._table_size = EUCTW_TABLE_SIZE
         self.typical_distribution_ratio = EUCTW_TYPICAL_DISTRIBUTION_RATIO
 
-    def get_order(self, byte_str: Union[bytes, bytearray]) -> int:  # type: ignore[reportIncompatibleMethodOverride]
+    def get_order(self, byte_str: Union[bytes, bytearray, memoryview]) -> int:  # type: ignore[reportIncompatibleMethodOverride]
         # for euc-TW encoding, we are interested
         #   first  byte range: 0xc4 -- 0xfe
         #   second byte range: 0xa1 -- 0xfe
@@ -148,12 +131,18 @@ class EUCTWDistributionAnalysis(CharDistributionAnalysis):
 
 class EUCKRDistributionAnalysis(CharDistributionAnalysis):
     def __init__(self) -> None:
+        from .freqtables import (
+            EUCKR_CHAR_TO_FREQ_ORDER,
+            EUCKR_TABLE_SIZE,
+            EUCKR_TYPICAL_DISTRIBUTION_RATIO,
+        )
+
         super().__init__()
         self._char_to_freq_order = EUCKR_CHAR_TO_FREQ_ORDER
         self._table_size = EUCKR_TABLE_SIZE
         self.typical_distribution_ratio = EUCKR_TYPICAL_DISTRIBUTION_RATIO
 
-    def get_order(self, byte_str: Union[bytes, bytearray]) -> int:  # type: ignore[reportIncompatibleMethodOverride]
+    def get_order(self, byte_str: Union[bytes, bytearray, memoryview]) -> int:  # type: ignore[reportIncompatibleMethodOverride]
         # for euc-KR encoding, we are interested
         #   first  byte range: 0xb0 -- 0xfe
         #   second byte range: 0xa1 -- 0xfe
@@ -166,27 +155,41 @@ class EUCKRDistributionAnalysis(CharDistributionAnalysis):
 
 class JOHABDistributionAnalysis(CharDistributionAnalysis):
     def __init__(self) -> None:
+        from .freqtables import (
+            EUCKR_CHAR_TO_FREQ_ORDER,
+            EUCKR_TABLE_SIZE,
+            EUCKR_TYPICAL_DISTRIBUTION_RATIO,
+            JOHAB_TO_EUCKR_ORDER_TABLE,
+        )
+
         super().__init__()
         self._char_to_freq_order = EUCKR_CHAR_TO_FREQ_ORDER
         self._table_size = EUCKR_TABLE_SIZE
         self.typical_distribution_ratio = EUCKR_TYPICAL_DISTRIBUTION_RATIO
+        self._johab_to_euckr_order = JOHAB_TO_EUCKR_ORDER_TABLE
 
-    def get_order(self, byte_str: Union[bytes, bytearray]) -> int:  # type: ignore[reportIncompatibleMethodOverride]
+    def get_order(self, byte_str: Union[bytes, bytearray, memoryview]) -> int:  # type: ignore[reportIncompatibleMethodOverride]
         first_char = byte_str[0]
         if 0x88 <= first_char < 0xD4:
             code = first_char * 256 + byte_str[1]
-            return JOHAB_TO_EUCKR_ORDER_TABLE.get(code, -1)
+            return self._johab_to_euckr_order.get(code, -1)
         return -1
 
 
 class GB2312DistributionAnalysis(CharDistributionAnalysis):
     def __init__(self) -> None:
+        from .freqtables import (
+            GB2312_CHAR_TO_FREQ_ORDER,
+            GB2312_TABLE_SIZE,
+            GB2312_TYPICAL_DISTRIBUTION_RATIO,
+        )
+
         super().__init__()
         self._char_to_freq_order = GB2312_CHAR_TO_FREQ_ORDER
         self._table_size = GB2312_TABLE_SIZE
         self.typical_distribution_ratio = GB2312_TYPICAL_DISTRIBUTION_RATIO
 
-    def get_order(self, byte_str: Union[bytes, bytearray]) -> int:  # type: ignore[reportIncompatibleMethodOverride]
+    def get_order(self, byte_str: Union[bytes, bytearray, memoryview]) -> int:  # type: ignore[reportIncompatibleMethodOverride]
         # for GB2312 encoding, we are interested
         #  first  byte range: 0xb0 -- 0xfe
         #  second byte range: 0xa1 -- 0xfe
@@ -199,12 +202,18 @@ class GB2312DistributionAnalysis(CharDistributionAnalysis):
 
 class Big5DistributionAnalysis(CharDistributionAnalysis):
     def __init__(self) -> None:
+        from .freqtables import (
+            BIG5_CHAR_TO_FREQ_ORDER,
+            BIG5_TABLE_SIZE,
+            BIG5_TYPICAL_DISTRIBUTION_RATIO,
+        )
+
         super().__init__()
         self._char_to_freq_order = BIG5_CHAR_TO_FREQ_ORDER
         self._table_size = BIG5_TABLE_SIZE
         self.typical_distribution_ratio = BIG5_TYPICAL_DISTRIBUTION_RATIO
 
-    def get_order(self, byte_str: Union[bytes, bytearray]) -> int:  # type: ignore[reportIncompatibleMethodOverride]
+    def get_order(self, byte_str: Union[bytes, bytearray, memoryview]) -> int:  # type: ignore[reportIncompatibleMethodOverride]
         # for big5 encoding, we are interested
         #   first  byte range: 0xa4 -- 0xfe
         #   second byte range: 0x40 -- 0x7e , 0xa1 -- 0xfe
@@ -219,12 +228,18 @@ class Big5DistributionAnalysis(CharDistributionAnalysis):
 
 class SJISDistributionAnalysis(CharDistributionAnalysis):
     def __init__(self) -> None:
+        from .freqtables import (
+            JIS_CHAR_TO_FREQ_ORDER,
+            JIS_TABLE_SIZE,
+            JIS_TYPICAL_DISTRIBUTION_RATIO,
+        )
+
         super().__init__()
         self._char_to_freq_order = JIS_CHAR_TO_FREQ_ORDER
         self._table_size = JIS_TABLE_SIZE
         self.typical_distribution_ratio = JIS_TYPICAL_DISTRIBUTION_RATIO
 
-    def get_order(self, byte_str: Union[bytes, bytearray]) -> int:  # type: ignore[reportIncompatibleMethodOverride]
+    def get_order(self, byte_str: Union[bytes, bytearray, memoryview]) -> int:  # type: ignore[reportIncompatibleMethodOverride]
         # for sjis encoding, we are interested
         #   first  byte range: 0x81 -- 0x9f , 0xe0 -- 0xfe
         #   second byte range: 0x40 -- 0x7e,  0x81 -- oxfe
@@ -244,12 +259,18 @@ class SJISDistributionAnalysis(CharDistributionAnalysis):
 
 class EUCJPDistributionAnalysis(CharDistributionAnalysis):
     def __init__(self) -> None:
+        from .freqtables import (
+            JIS_CHAR_TO_FREQ_ORDER,
+            JIS_TABLE_SIZE,
+            JIS_TYPICAL_DISTRIBUTION_RATIO,
+        )
+
         super().__init__()
         self._char_to_freq_order = JIS_CHAR_TO_FREQ_ORDER
         self._table_size = JIS_TABLE_SIZE
         self.typical_distribution_ratio = JIS_TYPICAL_DISTRIBUTION_RATIO
 
-    def get_order(self, byte_str: Union[bytes, bytearray]) -> int:  # type: ignore[reportIncompatibleMethodOverride]
+    def get_order(self, byte_str: Union[bytes, bytearray, memoryview]) -> int:  # type: ignore[reportIncompatibleMethodOverride]
         # for euc-JP encoding, we are interested
         #   first  byte range: 0xa0 -- 0xfe
         #   second byte range: 0xa1 -- 0xfe
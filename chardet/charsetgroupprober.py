@@ -46,6 +46,10 @@ class CharSetGroupProber(CharSetProber):
             self._active_num += 1
         self._best_guess_prober = None
 
+    def resync(self) -> None:
+        for prober in self.probers:
+            prober.resync()
+
     @property
     def charset_name(self) -> Optional[str]:
         if not self._best_guess_prober:
@@ -62,11 +66,11 @@ class CharSetGroupProber(CharSetProber):
                 return None
         return self._best_guess_prober.language
 
-    def feed(self, byte_str: Union[bytes, bytearray]) -> ProbingState:
+    def feed(self, byte_str: Union[bytes, bytearray, memoryview]) -> ProbingState:
         for prober in self.probers:
             if not prober.active:
                 continue
-            state = prober.feed(byte_str)
+            state = self._feed_prober(prober, byte_str)
             if not state:
                 continue
             if state == ProbingState.FOUND_IT:
@@ -81,6 +85,15 @@ class CharSetGroupProber(CharSetProber):
                     return self.state
         return self.state
 
+    def _feed_prober(
+        self, prober: CharSetProber, byte_str: Union[bytes, bytearray, memoryview]
+    ) -> ProbingState:
+        """
+        Feeds ``byte_str`` to a single member prober.  Subclasses can override
+        this to share work between their members.
+        """
+        return prober.feed(byte_str)
+
     def get_confidence(self) -> float:
         state = self.state
         if state == ProbingState.FOUND_IT:
@@ -31,9 +31,23 @@ from typing import Optional, Union
 
 from .enums import LanguageFilter, ProbingState
 
+# A whole word of letters and international characters, with at least one of
+# the latter, and the marker after it.  The lookbehind only lets a match start
+# at the beginning of a word, so that words of only English letters are
+# rejected once rather than once for every letter in them.
 INTERNATIONAL_WORDS_PATTERN = re.compile(
-    b"[a-zA-Z]*[\x80-\xff]+[a-zA-Z]*[^a-zA-Z\x80-\xff]?"
+    b"(?<![a-zA-Z])[a-zA-Z]*[\x80-\xff][a-zA-Z\x80-\xff]*[^a-zA-Z\x80-\xff]?"
 )
+# A bytes.translate table that turns every marker (see
+# filter_international_words) into a space
+MARKERS_TO_SPACES = bytes(
+    byte if 0x41 <= byte <= 0x5A or 0x61 <= byte <= 0x7A or byte >= 0x80 else 0x20
+    for byte in range(256)
+)
+# A stretch of text between the end of one tag and the start of the next, which
+# remove_xml_tags keeps.  Starting each match with a literal ">" lets the
+# regex engine skip ahead to the candidates.
+TEXT_BEFORE_TAG_PATTERN = re.compile(b">([^<>]+)(?=<)")
 
 
 class CharSetProber:
@@ -48,6 +62,20 @@ class CharSetProber:
     def reset(self) -> None:
         self._state = ProbingState.DETECTING
 
+    def resync(self) -> None:
+        """
+        Forget anything carried over from the end of the data fed so far,
+        because the next data fed does not directly follow it.  Anything
+        learned about the document so far is kept.
+        """
+
+    def rule_out(self) -> None:
+        """
+        Give up on this prober without feeding it, when something else has
+        already shown that the data is not in its encoding.
+        """
+        self._state = ProbingState.NOT_ME
+
     @property
     def charset_name(self) -> Optional[str]:
         return None
@@ -56,7 +84,7 @@ class CharSetProber:
     def language(self) -> Optional[str]:
         raise NotImplementedError
 
-    def feed(self, byte_str: Union[bytes, bytearray]) -> ProbingState:
+    def feed(self, byte_str: Union[bytes, bytearray, memoryview]) -> ProbingState:
         raise NotImplementedError
 
     @property
@@ -67,12 +95,14 @@ class CharSetProber:
         return 0.0
 
     @staticmethod
-    def filter_high_byte_only(buf: Union[bytes, bytearray]) -> bytes:
+    def filter_high_byte_only(buf: Union[bytes, bytearray, memoryview]) -> bytes:
         buf = re.sub(b"([\x00-\x7f])+", b" ", buf)
         return buf
 
     @staticmethod
-    def filter_international_words(buf: Union[bytes, bytearray]) -> bytearray:
+    def filter_international_words(
+        buf: Union[bytes, bytearray, memoryview],
+    ) -> bytearray:
         """
         We define three types of bytes:
         alphabet: english alphabets [a-zA-Z]
@@ -84,29 +114,19 @@ class CharSetProber:
         are replaced by a single space ascii character.
         This filter applies to all scripts which do not use English characters.
         """
-        filtered = bytearray()
-
         # This regex expression filters out only words that have at-least one
         # international character. The word may include one marker character at
         # the end.
         words = INTERNATIONAL_WORDS_PATTERN.findall(buf)
 
-        for word in words:
-            filtered.extend(word[:-1])
-
-            # If the last character in the word is a marker, replace it with a
-            # space as markers shouldn't affect our analysis (they are used
-            # similarly across all languages and may thus have similar
-            # frequencies).
-            last_char = word[-1:]
-            if not last_char.isalpha() and last_char < b"\x80":
-                last_char = b" "
-            filtered.extend(last_char)
-
-        return filtered
+        # Markers shouldn't affect our analysis (they are used similarly across
+        # all languages and may thus have similar frequencies), so the one at
+        # the end of each word is replaced with a space.  Words contain no other
+        # markers, so this can be done to all of them at once.
+        return bytearray(b"".join(words).translate(MARKERS_TO_SPACES))
 
     @staticmethod
-    def remove_xml_tags(buf: Union[bytes, bytearray]) -> bytearray:
+    def remove_xml_tags(buf: Union[bytes, bytearray, memoryview]) -> bytearray:
         """
         Returns a copy of ``buf`` that retains only the sequences of English
         alphabet and high byte characters that are not between <> characters.
@@ -114,32 +134,18 @@ class CharSetProber:
         characters and extended ASCII characters, but is currently only used by
         ``Latin1Prober``.
         """
-        filtered = bytearray()
-        in_tag = False
-        prev = 0
-        buf_view = memoryview(buf).cast("c")
-
-        for curr, buf_char in enumerate(buf_view):
-            # Check if we're coming out of or entering an XML tag
-
-            # https://github.com/python/typeshed/issues/8182
-            if buf_char == b">":  # type: ignore[comparison-overlap]
-                prev = curr + 1
-                in_tag = False
-            # https://github.com/python/typeshed/issues/8182
-            elif buf_char == b"<":  # type: ignore[comparison-overlap]
-                if curr > prev and not in_tag:
-                    # Keep everything after last non-extended-ASCII,
-                    # non-alphabetic character
-                    filtered.extend(buf[prev:curr])
-                    # Output a space to delimit stretch we kept
-                    filtered.extend(b" ")
-                in_tag = True
-
-        # If we're not in a tag...
-        if not in_tag:
-            # Keep everything after last non-extended-ASCII, non-alphabetic
-            # character
-            filtered.extend(buf[prev:])
+        # Keep each stretch between the end of one tag and the start of the
+        # next, followed by a space to delimit it.  The input is treated as if
+        # it started right after a tag.
+        buf = b">" + buf
+        texts = TEXT_BEFORE_TAG_PATTERN.findall(buf)
+        filtered = bytearray(b" ".join(texts))
+        if texts:
+            filtered += b" "
+
+        # If we're not in a tag at the end, keep everything after the last one
+        tag_end = buf.rfind(b">")
+        if buf.rfind(b"<") <= tag_end:
+            filtered += buf[tag_end + 1 :]
 
         return filtered
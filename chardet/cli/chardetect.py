@@ -40,7 +40,6 @@ def description_of(
     """
     u = UniversalDetector(should_rename_legacy=should_rename_legacy)
     for line in lines:
-        line = bytearray(line)
         u.feed(line)
         # shortcut out of the loop to save reading further - particularly useful if we read a BOM.
         if u.done:
@@ -25,11 +25,51 @@
 ######################### END LICENSE BLOCK #########################
 
 import logging
+import re
+from collections import deque
+from functools import lru_cache
+from itertools import accumulate, compress
+from operator import attrgetter, getitem, itemgetter
+from threading import Lock
+from typing import (
+    ClassVar,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from .codingstatemachinedict import CodingStateMachineDict
 from .enums import MachineState
 
 
+@lru_cache(maxsize=None)
+def _leave_start_pattern(
+    class_table: Sequence[int], state_table: Sequence[int], class_factor: int
+) -> Pattern[bytes]:
+    """
+    Returns a regex that finds the bytes that take a machine with these tables
+    out of START.  Patterns are cached, since creating one is slow enough to
+    matter for small documents.
+    """
+    start_row = MachineState.START * class_factor
+    leave_start = [
+        byte
+        for byte, byte_class in enumerate(class_table)
+        if state_table[start_row + byte_class] != MachineState.START
+    ]
+    if not leave_start:
+        # Never matches
+        return re.compile(b"(?!)")
+    return re.compile(
+        b"[" + b"".join(re.escape(bytes([byte])) for byte in leave_start) + b"]"
+    )
+
+
 class CodingStateMachine:
     """
     A state machine to verify a byte sequence for a particular encoding. For
@@ -51,13 +91,33 @@ class CodingStateMachine:
                  sequence for that encoding. This will lead to an immediate
                  negative answer for this encoding. Detector will exclude this
                  encoding from consideration from here on.
+
+    Feeding bytes one at a time through ``next_state`` is slow, so probers
+    should use ``run``, which steps the machine through a whole chunk at once.
     """
 
+    # How many bytes run steps through at first when skipping runs of START,
+    # before checking whether the machine is back in START
+    SKIP_WINDOW = 64
+
     def __init__(self, sm: CodingStateMachineDict) -> None:
         self._model = sm
         self._curr_byte_pos = 0
         self._curr_char_len = 0
         self._curr_state = MachineState.START
+        # The model in a form that run can use directly: a table for
+        # bytes.translate that turns bytes into their classes, and the
+        # state table with every state premultiplied by class_factor, so that
+        # the next state is just the entry at the current one plus the class.
+        factor = sm["class_factor"]
+        self._class_bytes = bytes(sm["class_table"])
+        self._transitions = tuple(state * factor for state in sm["state_table"])
+        self._error = MachineState.ERROR * factor
+        self._its_me = MachineState.ITS_ME * factor
+        self._first_other = (max(MachineState.ERROR, MachineState.ITS_ME) + 1) * factor
+        # Finds the bytes that take the machine out of START, looked up the
+        # first time run is asked to skip the ones that do not
+        self._leave_start: Optional[Pattern[bytes]] = None
         self.active = True
         self.logger = logging.getLogger(__name__)
         self.reset()
@@ -65,6 +125,103 @@ class CodingStateMachine:
     def reset(self) -> None:
         self._curr_state = MachineState.START
 
+    @property
+    def state(self) -> int:
+        return self._curr_state
+
+    @property
+    def model(self) -> CodingStateMachineDict:
+        return self._model
+
+    def run(
+        self,
+        byte_str: Union[bytes, bytearray, memoryview],
+        char_ends: Optional[List[int]] = None,
+        char_lens: Optional[List[int]] = None,
+        skip_start_runs: bool = False,
+    ) -> int:
+        """
+        Steps the machine through all of ``byte_str``, stopping early if it
+        reaches the ERROR or ITS_ME state, which ``state`` then holds.
+
+        If ``char_ends`` and ``char_lens`` are given, the index of the last
+        byte of every character that is completed along the way (i.e., every
+        time the machine returns to START) is appended to ``char_ends``, and
+        its length, as ``get_current_charlen`` would give it, to
+        ``char_lens``.
+
+        If ``skip_start_runs`` is set instead, runs of bytes that leave the
+        machine in START are found with a regex search and skipped rather than
+        stepped through, which is much quicker for machines that hardly ever
+        leave START, such as the escape sequence ones.
+
+        :returns:  The index of the byte the machine stopped at, or
+                   ``len(byte_str)`` if it did not stop.
+        """
+        if skip_start_runs:
+            return self._run_skipping_start_runs(byte_str)
+        # Classify the whole chunk in C, so that the loop only has to look up
+        # the transitions.  Only bytes has translate, but copying a memoryview
+        # takes a tiny fraction of the time the loop does.
+        byte_classes = bytes(byte_str).translate(self._class_bytes)
+        transitions = self._transitions
+        first_other = self._first_other
+        factor = self._model["class_factor"]
+        state = self._curr_state * factor
+        stop = len(byte_classes)
+        if char_ends is None or char_lens is None:
+            for i, byte_class in enumerate(byte_classes):
+                state = transitions[state + byte_class]
+                if state and state < first_other:
+                    stop = i
+                    break
+        else:
+            char_len_table = self._model["char_len_table"]
+            char_len = self._curr_char_len
+            for i, byte_class in enumerate(byte_classes):
+                if not state:
+                    char_len = char_len_table[byte_class]
+                state = transitions[state + byte_class]
+                if state < first_other:
+                    if state:
+                        stop = i
+                        break
+                    char_ends.append(i)
+                    char_lens.append(char_len)
+            self._curr_char_len = char_len
+        self._curr_state = state // factor
+        return stop
+
+    def _run_skipping_start_runs(
+        self, byte_str: Union[bytes, bytearray, memoryview]
+    ) -> int:
+        if self._leave_start is None:
+            self._leave_start = _leave_start_pattern(
+                self._model["class_table"],
+                self._model["state_table"],
+                self._model["class_factor"],
+            )
+        length = len(byte_str)
+        position = 0
+        window_size = self.SKIP_WINDOW
+        while position < length:
+            if self._curr_state == MachineState.START:
+                match = self._leave_start.search(byte_str, position)
+                if match is None:
+                    break
+                position = match.start()
+                window_size = self.SKIP_WINDOW
+            else:
+                # Some machines (like HZ's between "~{" and "~}") stay out of
+                # START for a long time, so step through more at once
+                window_size *= 2
+            window = byte_str[position : position + window_size]
+            stop = self.run(window)
+            if stop < len(window):
+                return position + stop
+            position += len(window)
+        return length
+
     def next_state(self, c: int) -> int:
         # for each byte we get its class
         # if it is first byte, we also get byte length
@@ -81,9 +238,288 @@ class CodingStateMachine:
     def get_current_charlen(self) -> int:
         return self._curr_char_len
 
+    def set_current_charlen(self, char_len: int) -> None:
+        self._curr_char_len = char_len
+
+    def set_state(self, state: int) -> None:
+        self._curr_state = state
+
     def get_coding_state_machine(self) -> str:
         return self._model["name"]
 
     @property
     def language(self) -> str:
         return self._model["language"]
+
+
+# Which bytes are ASCII, as a bytes.translate table
+_ASCII_FLAGS = bytes(byte < 0x80 for byte in range(256))
+
+# What FusedCodingStateMachine.run finds for each machine: the index it
+# stopped at, and the ends and lengths of the characters it completed, just
+# like CodingStateMachine.run.
+RunResult = Tuple[int, List[int], List[int]]
+
+
+class _FusedState(dict):
+    """
+    A state of a ``FusedCodingStateMachine``, which maps each byte to the
+    state that follows it.  Transitions are only worked out when they are
+    first needed, by ``__missing__``.
+    """
+
+    __slots__ = ("id", "machine_states", "at_start", "stopped", "_table")
+
+    def __init__(
+        self,
+        table: "_FusedStateTable",
+        state_id: int,
+        machine_states: Tuple[int, ...],
+    ) -> None:
+        super().__init__()
+        self._table = table
+        self.id = state_id
+        # The state of each of the machines
+        self.machine_states = machine_states
+        # Whether each of them has just finished a character, and whether it
+        # has reached ERROR or ITS_ME
+        self.at_start = tuple(state == MachineState.START for state in machine_states)
+        self.stopped = tuple(
+            state in (MachineState.ERROR, MachineState.ITS_ME)
+            for state in machine_states
+        )
+
+    def __missing__(self, byte: int) -> "_FusedState":
+        return self._table.add_transition(self, byte)
+
+
+class _FusedStateTable:
+    """
+    The states of a ``FusedCodingStateMachine`` that have been reached so far,
+    and the transitions between them.  States only ever lead to states in the
+    same table, so a table can be replaced by an empty one without upsetting a
+    run that is still using it.
+    """
+
+    def __init__(self, models: Sequence[CodingStateMachineDict]) -> None:
+        self._models = models
+        self._lock = Lock()
+        self._states: Dict[Tuple[int, ...], _FusedState] = {}
+        self.states_by_id: List[_FusedState] = []
+        # For each model, bytes.translate tables that tell whether the machine
+        # has just finished a character in the state with that id, and whether
+        # it has stopped.  These only cover the first 256 states.
+        self.at_start_tables = [bytearray(256) for _ in models]
+        self.stopped_tables = [bytearray(256) for _ in models]
+
+    def __len__(self) -> int:
+        return len(self.states_by_id)
+
+    def get_state(self, machine_states: Tuple[int, ...]) -> _FusedState:
+        with self._lock:
+            state = self._states.get(machine_states)
+            if state is None:
+                state = _FusedState(self, len(self.states_by_id), machine_states)
+                self._states[machine_states] = state
+                self.states_by_id.append(state)
+                if state.id < 256:
+                    for i in range(len(self._models)):
+                        self.at_start_tables[i][state.id] = state.at_start[i]
+                        self.stopped_tables[i][state.id] = state.stopped[i]
+            return state
+
+    def add_transition(self, state: _FusedState, byte: int) -> _FusedState:
+        next_machine_states = []
+        for model, machine_state in zip(self._models, state.machine_states):
+            # Stopped machines stay where they are
+            if machine_state not in (MachineState.ERROR, MachineState.ITS_ME):
+                byte_class = model["class_table"][byte]
+                machine_state = model["state_table"][
+                    machine_state * model["class_factor"] + byte_class
+                ]
+            next_machine_states.append(machine_state)
+        next_state = self.get_state(tuple(next_machine_states))
+        state[byte] = next_state
+        return next_state
+
+
+def _iter_states(
+    byte_str: Union[bytes, bytearray, memoryview], start_state: _FusedState
+) -> Iterator[_FusedState]:
+    """Returns an iterator over the state after each byte of ``byte_str``."""
+    states = accumulate(byte_str, getitem, initial=start_state)
+    next(states)
+    return states
+
+
+def _state_flags(
+    byte_str: bytes, start_state: _FusedState, name: str, index: int
+) -> bytes:
+    """
+    Returns flag ``index`` of attribute ``name`` of the state after each byte
+    of ``byte_str``.
+    """
+    flags = map(attrgetter(name), _iter_states(byte_str, start_state))
+    return bytes(map(itemgetter(index), flags))
+
+
+class FusedCodingStateMachine:
+    """
+    Steps several ``CodingStateMachine`` objects through the same bytes in a
+    single pass, instead of one pass per machine.
+
+    It works on the product of their models: each state of the fused machine
+    is a tuple of one state per model.  Transitions are worked out the first
+    time they are taken and then remembered, so after a short warm-up the pass
+    over the bytes is a chain of dict lookups that runs entirely in C, no
+    matter how many machines there are.  Where each machine finished a
+    character or stopped can be read off the states the pass went through.
+
+    The transitions only depend on the models, so one instance is shared by
+    every group of machines with the same models (see ``for_models``).  The
+    machines themselves still hold their own states, which ``run`` reads at
+    the start and writes back at the end.
+    """
+
+    # Once more product states than this have been reached, the next run
+    # starts over with an empty table, so that odd input cannot make it grow
+    # without bound.  Ordinary text reaches far fewer, and this many still
+    # have ids that fit in a byte.
+    MAX_STATES = 256
+
+    _instances: ClassVar[Dict[Tuple[int, ...], "FusedCodingStateMachine"]] = {}
+    _instances_lock: ClassVar[Lock] = Lock()
+
+    def __init__(self, models: Sequence[CodingStateMachineDict]) -> None:
+        self._models = list(models)
+        self._lock = Lock()
+        self._table = _FusedStateTable(self._models)
+        # For each model, a bytes.translate table that gives the length of the
+        # character each byte would start
+        self._char_len_bytes = [
+            bytes(
+                model["char_len_table"][model["class_table"][byte]]
+                for byte in range(256)
+            )
+            for model in self._models
+        ]
+
+    @classmethod
+    def for_models(
+        cls, models: Sequence[CodingStateMachineDict]
+    ) -> "FusedCodingStateMachine":
+        """Returns the shared instance for ``models``."""
+        key = tuple(map(id, models))
+        with cls._instances_lock:
+            fused = cls._instances.get(key)
+            if fused is None:
+                fused = cls._instances[key] = cls(models)
+        return fused
+
+    def _get_table(self) -> _FusedStateTable:
+        with self._lock:
+            if len(self._table) > self.MAX_STATES:
+                self._table = _FusedStateTable(self._models)
+            return self._table
+
+    def run(
+        self,
+        byte_str: Union[bytes, bytearray, memoryview],
+        machines: Sequence[Optional[CodingStateMachine]],
+        skip_ascii_runs: bool = False,
+    ) -> List[Optional[RunResult]]:
+        """
+        Runs each of ``machines`` (one per model, or ``None`` to leave that
+        one out) over ``byte_str``, and returns what ``CodingStateMachine.run``
+        would have returned for each of them, or ``None`` for those left out.
+
+        With ``skip_ascii_runs``, characters that are a single ASCII byte
+        following another one are left out of the results, which saves a lot
+        of work on mostly-ASCII input (such as markup or source code) when
+        they are of no interest.
+        """
+        start_machine_states = tuple(
+            MachineState.ERROR if machine is None else machine.state
+            for machine in machines
+        )
+        table = self._get_table()
+        start_state = table.get_state(start_machine_states)
+        num_bytes = len(byte_str)
+        # The id of the state after each byte, one byte each, rather than the
+        # states themselves
+        state_ids: Optional[bytes]
+        try:
+            state_ids = bytes(
+                map(attrgetter("id"), _iter_states(byte_str, start_state))
+            )
+        except ValueError:
+            # Some of the states are past the end of the translate tables, so
+            # each flag needed below takes a pass of its own
+            state_ids = None
+        if not num_bytes:
+            end_state = start_state
+        elif state_ids is not None:
+            end_state = table.states_by_id[state_ids[-1]]
+        else:
+            end_state = deque(_iter_states(byte_str, start_state), maxlen=1)[0]
+        # For translate, which only bytes has.  Copying a memoryview takes a
+        # tiny fraction of the time the pass above does.
+        byte_str = bytes(byte_str)
+        # The flags below are worked on as big integers, one byte per flag, so
+        # that shifting by 8 bits moves each flag on to the next byte.
+        ascii_pairs = 0
+        if skip_ascii_runs:
+            ascii_bits = int.from_bytes(byte_str.translate(_ASCII_FLAGS), "little")
+            ascii_pairs = ascii_bits & (ascii_bits << 8)
+
+        results: List[Optional[RunResult]] = []
+        for i, machine in enumerate(machines):
+            if machine is None:
+                results.append(None)
+                continue
+            if start_state.stopped[i]:
+                # It already stopped, so it stops again right away
+                results.append((0, [], []))
+                continue
+            # Where a character ends, and where this machine stopped, if it did
+            # (machines never leave ERROR or ITS_ME)
+            stop = num_bytes
+            if state_ids is not None:
+                end_flags = state_ids.translate(table.at_start_tables[i])
+                if end_state.stopped[i]:
+                    stop = state_ids.translate(table.stopped_tables[i]).find(1)
+            else:
+                end_flags = _state_flags(byte_str, start_state, "at_start", i)
+                if end_state.stopped[i]:
+                    stop = _state_flags(byte_str, start_state, "stopped", i).find(1)
+            end_bits = int.from_bytes(end_flags, "little")
+            start_bits = end_bits << 8
+            if start_machine_states[i] == MachineState.START:
+                start_bits |= 1
+            if ascii_pairs:
+                # A single ASCII byte right after another one
+                skipped_bits = ascii_pairs & end_bits & start_bits & (start_bits << 8)
+                end_bits ^= skipped_bits
+                start_bits ^= skipped_bits
+            char_ends = list(
+                compress(range(stop), end_bits.to_bytes(num_bytes + 2, "little"))
+            )
+            # The length of each character comes from its first byte
+            start_lens = bytes(
+                compress(
+                    byte_str.translate(self._char_len_bytes[i]),
+                    start_bits.to_bytes(num_bytes + 2, "little")[: stop + 1],
+                )
+            )
+            if start_machine_states[i] == MachineState.START:
+                char_lens = list(start_lens[: len(char_ends)])
+            else:
+                char_lens = [machine.get_current_charlen()]
+                char_lens.extend(start_lens[: len(char_ends) - 1])
+                del char_lens[len(char_ends) :]
+            # Leave the machine as CodingStateMachine.run would have
+            if start_lens:
+                machine.set_current_charlen(start_lens[-1])
+            machine.set_state(end_state.machine_states[i])
+            results.append((stop, char_ends, char_lens))
+        return results
@@ -0,0 +1,274 @@
+######################## BEGIN LICENSE BLOCK ########################
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, see
+# <https://www.gnu.org/licenses/>.
+######################### END LICENSE BLOCK #########################
+
+import os
+from mmap import mmap
+from typing import Hashable, Iterable, List, Optional, Tuple, Union
+
+from .cache import ResultCache
+from .charsetgroupprober import CharSetGroupProber
+from .charsetprober import CharSetProber
+from .enums import InputState, LanguageFilter
+from .resultdict import ResultDict
+from .sampling import SamplingPolicy, feed_sample
+from .universaldetector import UniversalDetector, as_byte_view
+
+StrPath = Union[str, "os.PathLike[str]"]
+
+
+class Detector:
+    """
+    A detection session that can be used to detect the encodings of many
+    documents, one after the other.
+
+    ``chardet.detect`` has to create a new ``UniversalDetector`` and a whole
+    new set of probers for every document it looks at.  A ``Detector`` creates
+    them once and then just resets them between documents, which makes it much
+    cheaper to run on lots of small documents:
+
+    .. code::
+
+            detector = Detector()
+            for document in documents:
+                print(detector.detect(document))
+
+    Restricting the encodings it considers with ``encodings`` or
+    ``exclude_encodings`` makes it faster still, since only the probers that
+    can answer with one of the remaining encodings are created and fed.
+    ``codec_prescreen`` trades some accuracy for speed on multi-byte input
+    (see ``UniversalDetector``).
+
+    A ``Detector`` is not thread-safe, so use one per thread.
+    """
+
+    def __init__(
+        self,
+        lang_filter: LanguageFilter = LanguageFilter.ALL,
+        should_rename_legacy: bool = False,
+        encodings: Optional[Iterable[str]] = None,
+        exclude_encodings: Optional[Iterable[str]] = None,
+        codec_prescreen: bool = False,
+    ) -> None:
+        self._detector = UniversalDetector(
+            lang_filter=lang_filter,
+            should_rename_legacy=should_rename_legacy,
+            encodings=encodings,
+            exclude_encodings=exclude_encodings,
+            codec_prescreen=codec_prescreen,
+        )
+
+    @property
+    def lang_filter(self) -> LanguageFilter:
+        return self._detector.lang_filter
+
+    @property
+    def should_rename_legacy(self) -> bool:
+        return self._detector.should_rename_legacy
+
+    def _cache_options(self, *options: Hashable) -> Tuple[Hashable, ...]:
+        return (
+            *options,
+            self.lang_filter,
+            self.should_rename_legacy,
+            self._detector.encoding_filter,
+            self._detector.codec_prescreen,
+        )
+
+    @staticmethod
+    def _as_view(byte_str: Union[bytes, bytearray, memoryview, mmap]) -> memoryview:
+        if not isinstance(byte_str, (bytes, bytearray, memoryview, mmap)):
+            raise TypeError(
+                "Expected object of type bytes, bytearray, memoryview or mmap, got: "
+                f"{type(byte_str)}"
+            )
+        return as_byte_view(byte_str)
+
+    def _run(self, byte_view: memoryview, sampling: Optional[SamplingPolicy]) -> None:
+        self._detector.reset()
+        if sampling is None:
+            self._detector.feed(byte_view)
+        else:
+            feed_sample(self._detector, byte_view, sampling)
+        self._detector.close()
+
+    def detect(
+        self,
+        byte_str: Union[bytes, bytearray, memoryview, mmap],
+        sampling: Optional[SamplingPolicy] = None,
+        cache: Optional[ResultCache] = None,
+    ) -> ResultDict:
+        """
+        Detect the encoding of the given byte string.
+
+        :param byte_str:     The byte sequence to examine.
+        :type byte_str:      ``bytes``, ``bytearray``, ``memoryview`` or ``mmap``
+        :param sampling:     Only look at the parts of ``byte_str`` that this
+                             picks, rather than all of it.
+        :type sampling:      ``chardet.sampling.SamplingPolicy``
+        :param cache:        Look the result up in this cache first, and add
+                             it if it is not there.
+        :type cache:         ``chardet.cache.ResultCache``
+        """
+        byte_view = self._as_view(byte_str)
+
+        def detect() -> ResultDict:
+            self._run(byte_view, sampling)
+            return self._detector.result
+
+        if cache is None:
+            return detect()
+        key = cache.make_key(
+            byte_view,
+            sampling,
+            self._cache_options("detect"),
+        )
+        return cache.get_or_detect(key, detect)
+
+    def detect_file(
+        self,
+        path: StrPath,
+        block_size: int = UniversalDetector.MAX_SLICE_SIZE,
+        sampling: Optional[SamplingPolicy] = None,
+    ) -> ResultDict:
+        """
+        Detect the encoding of the file at ``path``.
+
+        The file is read ``block_size`` bytes at a time into a single buffer,
+        and reading stops as soon as the result is certain, so large files are
+        neither loaded into memory nor necessarily read to the end.
+
+        :param path:        The path of the file to examine.
+        :type path:         ``str`` or ``os.PathLike``
+        :param block_size:  How many bytes to read at a time.
+        :type block_size:   ``int``
+        :param sampling:    Only read the parts of the file that this picks,
+                            rather than all of it.
+        :type sampling:     ``chardet.sampling.SamplingPolicy``
+        """
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        detector = self._detector
+        detector.reset()
+        buffer = bytearray(block_size)
+        buffer_view = memoryview(buffer)
+        with open(path, "rb", buffering=0) as f:
+            ranges: List[Tuple[int, Optional[int]]] = [(0, None)]
+            if sampling is not None:
+                ranges = list(sampling.ranges(os.fstat(f.fileno()).st_size))
+            position = 0
+            for start, end in ranges:
+                if start != position:
+                    detector.skip(start - position)
+                    f.seek(start)
+                    position = start
+                # The probers never hold on to the data they are fed, so the
+                # buffer can be overwritten as soon as feed returns.
+                while not detector.done and (end is None or position < end):
+                    to_read = (
+                        block_size if end is None else min(block_size, end - position)
+                    )
+                    size = f.readinto(buffer_view[:to_read])
+                    if not size:
+                        break
+                    detector.feed(buffer_view[:size])
+                    position += size
+                if detector.done:
+                    break
+        return detector.close()
+
+    def detect_all(
+        self,
+        byte_str: Union[bytes, bytearray, memoryview, mmap],
+        ignore_threshold: bool = False,
+        sampling: Optional[SamplingPolicy] = None,
+        cache: Optional[ResultCache] = None,
+    ) -> List[ResultDict]:
+        """
+        Detect all the possible encodings of the given byte string.
+
+        :param byte_str:          The byte sequence to examine.
+        :type byte_str:           ``bytes``, ``bytearray``, ``memoryview`` or
+                                  ``mmap``
+        :param ignore_threshold:  Include encodings that are below
+                                  ``UniversalDetector.MINIMUM_THRESHOLD``
+                                  in results.
+        :type ignore_threshold:   ``bool``
+        :param sampling:          Only look at the parts of ``byte_str`` that
+                                  this picks, rather than all of it.
+        :type sampling:           ``chardet.sampling.SamplingPolicy``
+        :param cache:             Look the results up in this cache first, and
+                                  add them if they are not there.
+        :type cache:              ``chardet.cache.ResultCache``
+        """
+        byte_view = self._as_view(byte_str)
+        if cache is None:
+            return self._detect_all(byte_view, ignore_threshold, sampling)
+        key = cache.make_key(
+            byte_view,
+            sampling,
+            self._cache_options("detect_all", ignore_threshold),
+        )
+        return cache.get_or_detect(
+            key, lambda: self._detect_all(byte_view, ignore_threshold, sampling)
+        )
+
+    def _detect_all(
+        self,
+        byte_view: memoryview,
+        ignore_threshold: bool,
+        sampling: Optional[SamplingPolicy],
+    ) -> List[ResultDict]:
+        self._run(byte_view, sampling)
+        detector = self._detector
+
+        if detector.input_state == InputState.HIGH_BYTE:
+            results: List[ResultDict] = []
+            probers: List[CharSetProber] = []
+            for prober in detector.charset_probers:
+                if isinstance(prober, CharSetGroupProber):
+                    probers.extend(p for p in prober.probers)
+                else:
+                    probers.append(prober)
+            for prober in probers:
+                if (
+                    ignore_threshold
+                    or prober.get_confidence() > detector.MINIMUM_THRESHOLD
+                ):
+                    charset_name = prober.charset_name or ""
+                    lower_charset_name = charset_name.lower()
+                    # Use Windows encoding name instead of ISO-8859 if we saw any
+                    # extra Windows-specific bytes
+                    if (
+                        lower_charset_name.startswith("iso-8859")
+                        and detector.has_win_bytes
+                    ):
+                        charset_name = detector.ISO_WIN_MAP.get(
+                            lower_charset_name, charset_name
+                        )
+                    # Rename legacy encodings with superset encodings if asked
+                    if detector.should_rename_legacy:
+                        charset_name = detector.LEGACY_MAP.get(
+                            charset_name.lower(), charset_name
+                        )
+                    results.append({
+                        "encoding": charset_name,
+                        "confidence": prober.get_confidence(),
+                        "language": prober.language,
+                    })
+            if len(results) > 0:
+                return sorted(results, key=lambda result: -result["confidence"])
+
+        return [detector.result]
@@ -0,0 +1,95 @@
+######################## BEGIN LICENSE BLOCK ########################
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, see
+# <https://www.gnu.org/licenses/>.
+######################### END LICENSE BLOCK #########################
+
+import codecs
+from typing import Dict, FrozenSet, Iterable, Optional
+
+
+def normalize_encoding_name(name: str) -> str:
+    """
+    Returns the name Python's codec registry uses for the encoding ``name``,
+    so that aliases like ``"latin-1"`` and ``"ISO-8859-1"`` compare equal.
+    Names Python does not know are just lowercased.
+    """
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return name.lower()
+
+
+class EncodingFilter:
+    """
+    Decides which probers a ``UniversalDetector`` creates, based on the
+    encodings they can answer with.
+
+    If ``encodings`` is given, only probers that can answer with one of them
+    are used, and probers that can only answer with encodings in
+    ``exclude_encodings`` are never used.  ``aliases`` maps the names probers
+    use to the names the detector may rename them to in its result (such as
+    ``ISO-8859-1`` to ``Windows-1252``), so that allowing either one keeps the
+    prober.
+    """
+
+    def __init__(
+        self,
+        encodings: Optional[Iterable[str]] = None,
+        exclude_encodings: Optional[Iterable[str]] = None,
+        aliases: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self._allowed: Optional[FrozenSet[str]] = None
+        if encodings is not None:
+            self._allowed = frozenset(map(normalize_encoding_name, encodings))
+        self._excluded = frozenset(
+            map(normalize_encoding_name, exclude_encodings or ())
+        )
+        self._aliases = {
+            normalize_encoding_name(name): normalize_encoding_name(alias)
+            for name, alias in (aliases or {}).items()
+        }
+
+    @property
+    def allows_all(self) -> bool:
+        return self._allowed is None and not self._excluded
+
+    def _allows_name(self, name: str) -> bool:
+        if self._allowed is not None and name not in self._allowed:
+            return False
+        return name not in self._excluded
+
+    def allows(self, *charset_names: str) -> bool:
+        """
+        Returns whether a prober that can answer with any of
+        ``charset_names`` should be used.
+        """
+        if self.allows_all:
+            return True
+        for charset_name in charset_names:
+            name = normalize_encoding_name(charset_name)
+            if self._allows_name(name):
+                return True
+            alias = self._aliases.get(name)
+            if alias and self._allows_name(alias):
+                return True
+        return False
+
+    def _key(self) -> tuple:
+        return (self._allowed, self._excluded, frozenset(self._aliases.items()))
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, EncodingFilter) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
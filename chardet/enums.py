@@ -28,10 +28,28 @@ class LanguageFilter(Flag):
     CHINESE_TRADITIONAL = 0x02
     JAPANESE = 0x04
     KOREAN = 0x08
+    # All of the languages the single-byte probers have models for
     NON_CJK = 0x10
-    ALL = 0x1F
+    # Each of those languages on its own, named after it in
+    # chardet.metadata.languages
+    RUSSIAN = 0x20
+    BULGARIAN = 0x40
+    GREEK = 0x80
+    HEBREW = 0x100
+    THAI = 0x200
+    TURKISH = 0x400
     CHINESE = CHINESE_SIMPLIFIED | CHINESE_TRADITIONAL
     CJK = CHINESE | JAPANESE | KOREAN
+    CYRILLIC = RUSSIAN | BULGARIAN
+    ALL = CJK | NON_CJK
+
+    @classmethod
+    def for_language(cls, language: str) -> "LanguageFilter":
+        """
+        Returns the flag for ``language`` (a name from
+        ``chardet.metadata.languages``), or ``NON_CJK`` if it has none.
+        """
+        return cls.__members__.get(language.upper(), cls.NON_CJK)
 
 
 class ProbingState(Enum):
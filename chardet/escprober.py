@@ -28,6 +28,7 @@ from typing import Optional, Union
 
 from .charsetprober import CharSetProber
 from .codingstatemachine import CodingStateMachine
+from .encodingfilter import EncodingFilter
 from .enums import LanguageFilter, MachineState, ProbingState
 from .escsm import (
     HZ_SM_MODEL,
@@ -44,16 +45,25 @@ class EscCharSetProber(CharSetProber):
     identify these encodings.
     """
 
-    def __init__(self, lang_filter: LanguageFilter = LanguageFilter.NONE) -> None:
+    def __init__(
+        self,
+        lang_filter: LanguageFilter = LanguageFilter.NONE,
+        encoding_filter: Optional[EncodingFilter] = None,
+    ) -> None:
         super().__init__(lang_filter=lang_filter)
-        self.coding_sm = []
+        sm_models = []
         if self.lang_filter & LanguageFilter.CHINESE_SIMPLIFIED:
-            self.coding_sm.append(CodingStateMachine(HZ_SM_MODEL))
-            self.coding_sm.append(CodingStateMachine(ISO2022CN_SM_MODEL))
+            sm_models.append(HZ_SM_MODEL)
+            sm_models.append(ISO2022CN_SM_MODEL)
         if self.lang_filter & LanguageFilter.JAPANESE:
-            self.coding_sm.append(CodingStateMachine(ISO2022JP_SM_MODEL))
+            sm_models.append(ISO2022JP_SM_MODEL)
         if self.lang_filter & LanguageFilter.KOREAN:
-            self.coding_sm.append(CodingStateMachine(ISO2022KR_SM_MODEL))
+            sm_models.append(ISO2022KR_SM_MODEL)
+        self.coding_sm = [
+            CodingStateMachine(sm_model)
+            for sm_model in sm_models
+            if encoding_filter is None or encoding_filter.allows(sm_model["name"])
+        ]
         self.active_sm_count = 0
         self._detected_charset: Optional[str] = None
         self._detected_language: Optional[str] = None
@@ -69,6 +79,10 @@ class EscCharSetProber(CharSetProber):
         self._detected_charset = None
         self._detected_language = None
 
+    def resync(self) -> None:
+        for coding_sm in self.coding_sm:
+            coding_sm.reset()
+
     @property
     def charset_name(self) -> Optional[str]:
         return self._detected_charset
@@ -80,22 +94,32 @@ class EscCharSetProber(CharSetProber):
     def get_confidence(self) -> float:
         return 0.99 if self._detected_charset else 0.00
 
-    def feed(self, byte_str: Union[bytes, bytearray]) -> ProbingState:
-        for c in byte_str:
-            for coding_sm in self.coding_sm:
-                if not coding_sm.active:
-                    continue
-                coding_state = coding_sm.next_state(c)
-                if coding_state == MachineState.ERROR:
-                    coding_sm.active = False
-                    self.active_sm_count -= 1
-                    if self.active_sm_count <= 0:
-                        self._state = ProbingState.NOT_ME
-                        return self.state
-                elif coding_state == MachineState.ITS_ME:
-                    self._state = ProbingState.FOUND_IT
-                    self._detected_charset = coding_sm.get_coding_state_machine()
-                    self._detected_language = coding_sm.language
-                    return self.state
+    def feed(self, byte_str: Union[bytes, bytearray, memoryview]) -> ProbingState:
+        # Run each machine over the whole chunk.  The one that recognizes its
+        # escape sequence first wins, ties going to the earlier machine.  They
+        # only leave START at an escape or shift sequence (or a byte they do
+        # not allow), so everything in between is skipped.
+        found_sm: Optional[CodingStateMachine] = None
+        found_at = len(byte_str)
+        for coding_sm in self.coding_sm:
+            if not coding_sm.active:
+                continue
+            stop = coding_sm.run(byte_str, skip_start_runs=True)
+            if stop == len(byte_str):
+                continue
+            if coding_sm.state == MachineState.ITS_ME:
+                if stop < found_at:
+                    found_sm = coding_sm
+                    found_at = stop
+            else:
+                coding_sm.active = False
+                self.active_sm_count -= 1
+
+        if found_sm is not None:
+            self._state = ProbingState.FOUND_IT
+            self._detected_charset = found_sm.get_coding_state_machine()
+            self._detected_language = found_sm.language
+        elif self.active_sm_count <= 0:
+            self._state = ProbingState.NOT_ME
 
         return self.state
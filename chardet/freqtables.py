@@ -0,0 +1,59 @@
+######################## BEGIN LICENSE BLOCK ########################
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, see
+# <https://www.gnu.org/licenses/>.
+######################### END LICENSE BLOCK #########################
+"""
+The character frequency tables used by chardistribution and jpcntx.
+
+This file was generated by build_binary_tables.py from big5freq.py, euckrfreq.py, euctwfreq.py, gb2312freq.py, jisfreq.py, johabfreq.py, jpcntxfreq.py.
+Do not edit it by hand; edit those and rerun the script instead.
+"""
+
+from .binarytables import BinaryTables
+
+_TABLES = BinaryTables.load("freqtables.bin")
+
+# From big5freq.py
+BIG5_TYPICAL_DISTRIBUTION_RATIO = 0.75
+BIG5_TABLE_SIZE = 5376
+BIG5_CHAR_TO_FREQ_ORDER = _TABLES.get_array("BIG5_CHAR_TO_FREQ_ORDER")
+
+# From euckrfreq.py
+EUCKR_TYPICAL_DISTRIBUTION_RATIO = 6.0
+EUCKR_TABLE_SIZE = 2352
+EUCKR_CHAR_TO_FREQ_ORDER = _TABLES.get_array("EUCKR_CHAR_TO_FREQ_ORDER")
+
+# From euctwfreq.py
+EUCTW_TYPICAL_DISTRIBUTION_RATIO = 0.75
+EUCTW_TABLE_SIZE = 5376
+EUCTW_CHAR_TO_FREQ_ORDER = _TABLES.get_array("EUCTW_CHAR_TO_FREQ_ORDER")
+
+# From gb2312freq.py
+GB2312_TYPICAL_DISTRIBUTION_RATIO = 0.9
+GB2312_TABLE_SIZE = 3760
+GB2312_CHAR_TO_FREQ_ORDER = _TABLES.get_array("GB2312_CHAR_TO_FREQ_ORDER")
+
+# From jisfreq.py
+JIS_TYPICAL_DISTRIBUTION_RATIO = 3.0
+JIS_TABLE_SIZE = 4368
+JIS_CHAR_TO_FREQ_ORDER = _TABLES.get_array("JIS_CHAR_TO_FREQ_ORDER")
+
+# From johabfreq.py
+JOHAB_TO_EUCKR_ORDER_TABLE = dict(
+    zip(_TABLES.get_array("JOHAB_CODES"), _TABLES.get_array("JOHAB_ORDERS"))
+)
+
+# From jpcntxfreq.py, one row after another
+JP2_CHAR_CONTEXT_SIZE = 83
+JP2_CHAR_CONTEXT = _TABLES.get_bytes("JP2_CHAR_CONTEXT")
@@ -175,6 +175,11 @@ class HebrewProber(CharSetProber):
         self._before_prev = self.SPACE
         # These probers are owned by the group prober.
 
+    def resync(self) -> None:
+        # Pretend there was a word delimiter in the gap
+        self._prev = self.SPACE
+        self._before_prev = self.SPACE
+
     def set_model_probers(
         self,
         logical_prober: SingleByteCharSetProber,
@@ -205,7 +210,7 @@ class HebrewProber(CharSetProber):
         # since these words are quite rare.
         return c in [self.NORMAL_KAF, self.NORMAL_MEM, self.NORMAL_NUN, self.NORMAL_PE]
 
-    def feed(self, byte_str: Union[bytes, bytearray]) -> ProbingState:
+    def feed(self, byte_str: Union[bytes, bytearray, memoryview]) -> ProbingState:
         # Final letter analysis for logical-visual decision.
         # Look for evidence that the received buffer is either logical Hebrew
         # or visual Hebrew.
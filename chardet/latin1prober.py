@@ -25,10 +25,14 @@
 # <https://www.gnu.org/licenses/>.
 ######################### END LICENSE BLOCK #########################
 
-from typing import List, Union
+import sys
+from functools import lru_cache
+from typing import List, Sequence, Union
 
 from .charsetprober import CharSetProber
 from .enums import ProbingState
+from .sbcharsetprober import ByteHistogram
+from .textfilter import XMLTagFilter
 
 FREQ_CAT_NUM = 4
 
@@ -96,18 +100,50 @@ Latin1ClassModel = (
 # fmt: on
 
 
+@lru_cache(maxsize=None)
+def get_class_pair_table(
+    char_to_class: Sequence[int], class_model: Sequence[int], class_num: int
+) -> bytes:
+    """
+    Returns a table mapping each native-endian byte pair key (see
+    ``ByteHistogram``) to the frequency category that ``class_model`` gives
+    the classes of those two bytes.
+    """
+    class_rows = [
+        bytes(
+            class_model[first * class_num + char_to_class[second]]
+            for second in range(256)
+        )
+        for first in range(class_num)
+    ]
+    # Row-major order matches big-endian pair keys, see get_pair_table
+    pair_table = b"".join(class_rows[char_to_class[first]] for first in range(256))
+    if sys.byteorder == "little":
+        pair_table = b"".join(pair_table[i::256] for i in range(256))
+    return pair_table
+
+
 class Latin1Prober(CharSetProber):
     def __init__(self) -> None:
         super().__init__()
         self._last_char_class = OTH
         self._freq_counter: List[int] = []
+        self._tag_filter = XMLTagFilter()
+        self._pair_table = get_class_pair_table(
+            Latin1_CharToClass, Latin1ClassModel, CLASS_NUM
+        )
         self.reset()
 
     def reset(self) -> None:
         self._last_char_class = OTH
+        self._tag_filter.reset()
         self._freq_counter = [0] * FREQ_CAT_NUM
         super().reset()
 
+    def resync(self) -> None:
+        self._last_char_class = OTH
+        self._tag_filter.reset()
+
     @property
     def charset_name(self) -> str:
         return "ISO-8859-1"
@@ -116,17 +152,29 @@ class Latin1Prober(CharSetProber):
     def language(self) -> str:
         return ""
 
-    def feed(self, byte_str: Union[bytes, bytearray]) -> ProbingState:
-        byte_str = self.remove_xml_tags(byte_str)
-        for c in byte_str:
-            char_class = Latin1_CharToClass[c]
-            freq = Latin1ClassModel[(self._last_char_class * CLASS_NUM) + char_class]
-            if freq == 0:
-                self._state = ProbingState.NOT_ME
-                break
-            self._freq_counter[freq] += 1
-            self._last_char_class = char_class
+    def feed(self, byte_str: Union[bytes, bytearray, memoryview]) -> ProbingState:
+        return self.feed_histogram(ByteHistogram(self._tag_filter.filter(byte_str)))
 
+    def feed_histogram(self, histogram: ByteHistogram) -> ProbingState:
+        """
+        Like ``feed``, but for input that has already had its XML tags removed
+        and been counted up in a ``ByteHistogram``.
+        """
+        if not histogram.byte_counts:
+            return self.state
+        freq_counter = self._freq_counter
+        # The pair straddling the previous chunk and this one
+        first_class = Latin1_CharToClass[histogram.first_byte]
+        freq_counter[
+            Latin1ClassModel[self._last_char_class * CLASS_NUM + first_class]
+        ] += 1
+        pair_table = self._pair_table
+        for pair, count in histogram.pair_counts.items():
+            freq_counter[pair_table[pair]] += count
+        self._last_char_class = Latin1_CharToClass[histogram.last_byte]
+        # Any pair in the undefined category rules us out
+        if freq_counter[0]:
+            self._state = ProbingState.NOT_ME
         return self.state
 
     def get_confidence(self) -> float:
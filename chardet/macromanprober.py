@@ -32,6 +32,9 @@ from typing import List, Union
 
 from .charsetprober import CharSetProber
 from .enums import ProbingState
+from .latin1prober import get_class_pair_table
+from .sbcharsetprober import ByteHistogram
+from .textfilter import XMLTagFilter
 
 FREQ_CAT_NUM = 4
 
@@ -111,10 +114,15 @@ class MacRomanProber(CharSetProber):
         super().__init__()
         self._last_char_class = OTH
         self._freq_counter: List[int] = []
+        self._tag_filter = XMLTagFilter()
+        self._pair_table = get_class_pair_table(
+            MacRoman_CharToClass, MacRomanClassModel, CLASS_NUM
+        )
         self.reset()
 
     def reset(self) -> None:
         self._last_char_class = OTH
+        self._tag_filter.reset()
         self._freq_counter = [0] * FREQ_CAT_NUM
 
         # express the prior that MacRoman is a somewhat rare encoding;
@@ -124,6 +132,10 @@ class MacRomanProber(CharSetProber):
 
         super().reset()
 
+    def resync(self) -> None:
+        self._last_char_class = OTH
+        self._tag_filter.reset()
+
     @property
     def charset_name(self) -> str:
         return "MacRoman"
@@ -132,17 +144,29 @@ class MacRomanProber(CharSetProber):
     def language(self) -> str:
         return ""
 
-    def feed(self, byte_str: Union[bytes, bytearray]) -> ProbingState:
-        byte_str = self.remove_xml_tags(byte_str)
-        for c in byte_str:
-            char_class = MacRoman_CharToClass[c]
-            freq = MacRomanClassModel[(self._last_char_class * CLASS_NUM) + char_class]
-            if freq == 0:
-                self._state = ProbingState.NOT_ME
-                break
-            self._freq_counter[freq] += 1
-            self._last_char_class = char_class
-
+    def feed(self, byte_str: Union[bytes, bytearray, memoryview]) -> ProbingState:
+        return self.feed_histogram(ByteHistogram(self._tag_filter.filter(byte_str)))
+
+    def feed_histogram(self, histogram: ByteHistogram) -> ProbingState:
+        """
+        Like ``feed``, but for input that has already had its XML tags removed
+        and been counted up in a ``ByteHistogram``.
+        """
+        if not histogram.byte_counts:
+            return self.state
+        freq_counter = self._freq_counter
+        # The pair straddling the previous chunk and this one
+        first_class = MacRoman_CharToClass[histogram.first_byte]
+        freq_counter[
+            MacRomanClassModel[self._last_char_class * CLASS_NUM + first_class]
+        ] += 1
+        pair_table = self._pair_table
+        for pair, count in histogram.pair_counts.items():
+            freq_counter[pair_table[pair]] += count
+        self._last_char_class = MacRoman_CharToClass[histogram.last_byte]
+        # Any pair in the undefined category rules us out
+        if freq_counter[0]:
+            self._state = ProbingState.NOT_ME
         return self.state
 
     def get_confidence(self) -> float:
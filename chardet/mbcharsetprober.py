@@ -26,7 +26,8 @@
 # <https://www.gnu.org/licenses/>.
 ######################### END LICENSE BLOCK #########################
 
-from typing import Optional, Union
+from itertools import compress
+from typing import List, Optional, Union
 
 from .chardistribution import CharDistributionAnalysis
 from .charsetprober import CharSetProber
@@ -53,31 +54,63 @@ class MultiByteCharSetProber(CharSetProber):
             self.distribution_analyzer.reset()
         self._last_char = bytearray(b"\0\0")
 
-    def feed(self, byte_str: Union[bytes, bytearray]) -> ProbingState:
+    def resync(self) -> None:
+        if self.coding_sm:
+            self.coding_sm.reset()
+        self._last_char = bytearray(b"\0\0")
+
+    def feed(self, byte_str: Union[bytes, bytearray, memoryview]) -> ProbingState:
         assert self.coding_sm is not None
-        assert self.distribution_analyzer is not None
+        char_ends: List[int] = []
+        char_lens: List[int] = []
+        stop = self.coding_sm.run(byte_str, char_ends, char_lens)
+        return self.feed_chars(byte_str, stop, char_ends, char_lens)
 
-        for i, byte in enumerate(byte_str):
-            coding_state = self.coding_sm.next_state(byte)
-            if coding_state == MachineState.ERROR:
+    def _check_stop(
+        self, byte_str: Union[bytes, bytearray, memoryview], stop: int
+    ) -> None:
+        assert self.coding_sm is not None
+        if stop < len(byte_str):
+            if self.coding_sm.state == MachineState.ERROR:
                 self.logger.debug(
                     "%s %s prober hit error at byte %s",
                     self.charset_name,
                     self.language,
-                    i,
+                    stop,
                 )
                 self._state = ProbingState.NOT_ME
-                break
-            if coding_state == MachineState.ITS_ME:
+            else:
                 self._state = ProbingState.FOUND_IT
-                break
-            if coding_state == MachineState.START:
-                char_len = self.coding_sm.get_current_charlen()
-                if i == 0:
-                    self._last_char[1] = byte
-                    self.distribution_analyzer.feed(self._last_char, char_len)
-                else:
-                    self.distribution_analyzer.feed(byte_str[i - 1 : i + 1], char_len)
+
+    def feed_chars(
+        self,
+        byte_str: Union[bytes, bytearray, memoryview],
+        stop: int,
+        char_ends: List[int],
+        char_lens: List[int],
+    ) -> ProbingState:
+        """
+        Does the rest of ``feed``, given what running ``coding_sm`` over
+        ``byte_str`` found (see ``CodingStateMachine.run``).  This lets
+        ``MBCSGroupProber`` run the state machines of all of its probers in a
+        single pass and then hand each prober its results.
+
+        Characters that are a single ASCII byte following another one may be
+        left out of ``char_ends`` and ``char_lens`` (see
+        ``FusedCodingStateMachine.run``), so they must make no difference.
+        """
+        assert self.distribution_analyzer is not None
+        self._check_stop(byte_str, stop)
+
+        # The distribution analyzer only counts two-byte characters, so all of
+        # the others (mostly ASCII) are dropped before the loop, at C speed
+        feed_analyzer = self.distribution_analyzer.feed
+        for i in compress(char_ends, map((2).__eq__, char_lens)):
+            if i == 0:
+                self._last_char[1] = byte_str[0]
+                feed_analyzer(self._last_char, 2)
+            else:
+                feed_analyzer(byte_str[i - 1 : i + 1], 2)
 
         self._last_char[0] = byte_str[-1]
 
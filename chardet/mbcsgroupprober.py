@@ -26,31 +26,175 @@
 # <https://www.gnu.org/licenses/>.
 ######################### END LICENSE BLOCK #########################
 
+import codecs
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
 from .big5prober import Big5Prober
 from .charsetgroupprober import CharSetGroupProber
+from .charsetprober import CharSetProber
+from .codingstatemachine import FusedCodingStateMachine, RunResult
 from .cp949prober import CP949Prober
-from .enums import LanguageFilter
+from .encodingfilter import EncodingFilter
+from .enums import LanguageFilter, ProbingState
 from .eucjpprober import EUCJPProber
 from .euckrprober import EUCKRProber
 from .euctwprober import EUCTWProber
 from .gb2312prober import GB2312Prober
 from .johabprober import JOHABProber
+from .mbcharsetprober import MultiByteCharSetProber
 from .sjisprober import SJISProber
 from .utf8prober import UTF8Prober
 
 
 class MBCSGroupProber(CharSetGroupProber):
-    def __init__(self, lang_filter: LanguageFilter = LanguageFilter.NONE) -> None:
+    """
+    Runs all of the multi-byte probers.
+
+    With ``codec_prescreen``, each chunk is first run through the C decoder
+    for each prober's encoding, and probers whose decoder rejects it are ruled
+    out without being fed.  This is faster, but the codecs do not agree with
+    the probers on every byte sequence, so it can change the result.
+    """
+
+    # Each prober, along with the encodings it can answer with
+    PROBERS: List[Tuple[Callable[[], CharSetProber], Tuple[str, ...]]] = [
+        (UTF8Prober, ("utf-8",)),
+        (SJISProber, ("SHIFT_JIS", "CP932")),
+        (EUCJPProber, ("EUC-JP",)),
+        (GB2312Prober, ("GB2312",)),
+        (EUCKRProber, ("EUC-KR",)),
+        (CP949Prober, ("CP949",)),
+        (Big5Prober, ("Big5",)),
+        (EUCTWProber, ("EUC-TW",)),
+        (JOHABProber, ("Johab",)),
+    ]
+
+    # For the codec pre-screen, the most lenient Python codec that can decode
+    # whatever each prober can answer with.  There is none for EUC-TW.
+    PRESCREEN_CODECS: Dict[Callable[[], CharSetProber], str] = {
+        UTF8Prober: "utf-8",
+        SJISProber: "cp932",
+        EUCJPProber: "euc_jis_2004",
+        GB2312Prober: "gb18030",
+        EUCKRProber: "cp949",
+        CP949Prober: "cp949",
+        Big5Prober: "big5hkscs",
+        JOHABProber: "johab",
+    }
+
+    def __init__(
+        self,
+        lang_filter: LanguageFilter = LanguageFilter.NONE,
+        encoding_filter: Optional[EncodingFilter] = None,
+        codec_prescreen: bool = False,
+    ) -> None:
         super().__init__(lang_filter=lang_filter)
         self.probers = [
-            UTF8Prober(),
-            SJISProber(),
-            EUCJPProber(),
-            GB2312Prober(),
-            EUCKRProber(),
-            CP949Prober(),
-            Big5Prober(),
-            EUCTWProber(),
-            JOHABProber(),
+            prober_class()
+            for prober_class, charset_names in self.PROBERS
+            if encoding_filter is None or encoding_filter.allows(*charset_names)
+        ]
+        # All of our probers check their input with a state machine, and those
+        # are run over each chunk together, in a single pass
+        self._sm_probers = [
+            prober
+            for prober in self.probers
+            if isinstance(prober, (MultiByteCharSetProber, UTF8Prober))
+            and prober.coding_sm is not None
         ]
+        self._fused_sm = FusedCodingStateMachine.for_models([
+            prober.coding_sm.model
+            for prober in self._sm_probers
+            if prober.coding_sm is not None
+        ])
+        # What the state machines found in the chunk currently being fed, once
+        # they have been run over it, and the probers that did not need them
+        self._run_results: Optional[Dict[CharSetProber, RunResult]] = None
+        self._fed_fast: Set[CharSetProber] = set()
+        # An incremental decoder for each prober that the codec pre-screen
+        # checks
+        self._decoders: Dict[CharSetProber, codecs.IncrementalDecoder] = {}
+        if codec_prescreen:
+            for prober in self.probers:
+                codec = self.PRESCREEN_CODECS.get(type(prober))
+                if codec:
+                    self._decoders[prober] = codecs.getincrementaldecoder(codec)()
         self.reset()
+
+    def reset(self) -> None:
+        super().reset()
+        for decoder in self._decoders.values():
+            decoder.reset()
+
+    def resync(self) -> None:
+        super().resync()
+        for decoder in self._decoders.values():
+            decoder.reset()
+
+    def _prescreen(self, byte_str: Union[bytes, bytearray, memoryview]) -> None:
+        for prober, decoder in self._decoders.items():
+            if not prober.active:
+                continue
+            try:
+                decoder.decode(byte_str)
+            except UnicodeDecodeError:
+                self.logger.debug(
+                    "%s %s prober ruled out by the codec pre-screen",
+                    prober.charset_name,
+                    prober.language,
+                )
+                prober.rule_out()
+
+    def feed(self, byte_str: Union[bytes, bytearray, memoryview]) -> ProbingState:
+        self._prescreen(byte_str)
+        try:
+            return super().feed(byte_str)
+        finally:
+            self._run_results = None
+            self._fed_fast.clear()
+
+    def _run_state_machines(
+        self, byte_str: Union[bytes, bytearray, memoryview]
+    ) -> Dict[CharSetProber, RunResult]:
+        probers = [
+            prober
+            if prober.active
+            and prober.state != ProbingState.NOT_ME
+            and prober not in self._fed_fast
+            else None
+            for prober in self._sm_probers
+        ]
+        results = self._fused_sm.run(
+            byte_str,
+            [prober and prober.coding_sm for prober in probers],
+            # None of our probers care about runs of ASCII
+            skip_ascii_runs=True,
+        )
+        return {
+            prober: result
+            for prober, result in zip(probers, results)
+            if prober is not None and result is not None
+        }
+
+    def _feed_prober(
+        self, prober: CharSetProber, byte_str: Union[bytes, bytearray, memoryview]
+    ) -> ProbingState:
+        if prober.state == ProbingState.NOT_ME:
+            # Ruled out by the codec pre-screen
+            return ProbingState.NOT_ME
+        if not isinstance(prober, (MultiByteCharSetProber, UTF8Prober)):
+            return prober.feed(byte_str)
+        if isinstance(prober, UTF8Prober):
+            # Valid UTF-8 is much quicker to check with Python's decoder, and
+            # since it comes first, the state machines may not have to be run
+            # at all if it turns out to be sure.
+            state = prober.feed_fast(byte_str)
+            if state is not None:
+                self._fed_fast.add(prober)
+                return state
+        if self._run_results is None:
+            self._run_results = self._run_state_machines(byte_str)
+        result = self._run_results.get(prober)
+        if result is None:
+            return prober.feed(byte_str)
+        return prober.feed_chars(byte_str, *result)
@@ -0,0 +1,134 @@
+######################## BEGIN LICENSE BLOCK ########################
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, see
+# <https://www.gnu.org/licenses/>.
+######################### END LICENSE BLOCK #########################
+"""
+Sampling policies, which pick the parts of a large document that the detector
+looks at, so that the time it takes is bounded no matter how large the
+document is.
+
+The parts that are picked are fed to a ``UniversalDetector`` in order, with
+``UniversalDetector.skip`` called for each gap between them.  Every policy
+always includes the start of the document, so that BOMs are still found.
+"""
+
+from typing import List, Tuple
+
+from .universaldetector import UniversalDetector
+
+
+class SamplingPolicy:
+    """
+    The base class for sampling policies.  On its own it picks the whole
+    document.
+    """
+
+    def ranges(self, size: int) -> List[Tuple[int, int]]:
+        """
+        Returns the ``(start, end)`` offsets of the parts of a ``size`` byte
+        document to look at, sorted and without any overlaps.
+        """
+        return [(0, size)] if size else []
+
+    @staticmethod
+    def _merge(ranges: List[Tuple[int, int]], size: int) -> List[Tuple[int, int]]:
+        merged: List[Tuple[int, int]] = []
+        for start, end in sorted(ranges):
+            start, end = max(start, 0), min(end, size)
+            if start >= end:
+                continue
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def __repr__(self) -> str:
+        attrs = ", ".join(f"{name}={value!r}" for name, value in vars(self).items())
+        return f"{self.__class__.__name__}({attrs})"
+
+    def __eq__(self, other: object) -> bool:
+        return type(self) is type(other) and vars(self) == vars(other)
+
+    def __hash__(self) -> int:
+        return hash((type(self), tuple(sorted(vars(self).items()))))
+
+
+class Head(SamplingPolicy):
+    """Looks at no more than the first ``max_bytes`` bytes of the document."""
+
+    def __init__(self, max_bytes: int) -> None:
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        self.max_bytes = max_bytes
+
+    def ranges(self, size: int) -> List[Tuple[int, int]]:
+        return self._merge([(0, self.max_bytes)], size)
+
+
+class HeadMiddleTail(SamplingPolicy):
+    """
+    Looks at a window of ``window_size`` bytes at the start, in the middle and
+    at the end of the document.
+    """
+
+    def __init__(self, window_size: int) -> None:
+        if window_size < 1:
+            raise ValueError("window_size must be at least 1")
+        self.window_size = window_size
+
+    def ranges(self, size: int) -> List[Tuple[int, int]]:
+        window = self.window_size
+        middle = (size - window) // 2
+        return self._merge(
+            [(0, window), (middle, middle + window), (size - window, size)], size
+        )
+
+
+class Strided(SamplingPolicy):
+    """
+    Looks at ``num_blocks`` blocks of ``block_size`` bytes, spread evenly over
+    the document from its start to its end.
+    """
+
+    def __init__(self, block_size: int, num_blocks: int) -> None:
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        if num_blocks < 1:
+            raise ValueError("num_blocks must be at least 1")
+        self.block_size = block_size
+        self.num_blocks = num_blocks
+
+    def ranges(self, size: int) -> List[Tuple[int, int]]:
+        block_size = self.block_size
+        if self.num_blocks == 1:
+            return self._merge([(0, block_size)], size)
+        stride = max(size - block_size, 0) / (self.num_blocks - 1)
+        starts = (round(i * stride) for i in range(self.num_blocks))
+        return self._merge([(start, start + block_size) for start in starts], size)
+
+
+def feed_sample(
+    detector: UniversalDetector, byte_view: memoryview, sampling: SamplingPolicy
+) -> None:
+    """
+    Feeds the parts of ``byte_view`` that ``sampling`` picks to ``detector``.
+    """
+    position = 0
+    for start, end in sampling.ranges(len(byte_view)):
+        detector.skip(start - position)
+        detector.feed(byte_view[start:end])
+        position = end
+        if detector.done:
+            break
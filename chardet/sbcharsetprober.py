@@ -25,10 +25,14 @@
 # <https://www.gnu.org/licenses/>.
 ######################### END LICENSE BLOCK #########################
 
-from typing import Dict, List, NamedTuple, Optional, Union
+import sys
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 
 from .charsetprober import CharSetProber
 from .enums import CharacterCategory, ProbingState, SequenceLikelihood
+from .textfilter import InternationalWordsFilter, TextFilter, XMLTagFilter
 
 
 class SingleByteCharSetModel(NamedTuple):
@@ -41,6 +45,142 @@ class SingleByteCharSetModel(NamedTuple):
     alphabet: str
 
 
+class ByteHistogram:
+    """
+    Counts of the bytes and adjacent byte pairs in a chunk of (filtered) input.
+    This is all ``SingleByteCharSetProber``, ``Latin1Prober`` and
+    ``MacRomanProber`` need to score a chunk, so a group of probers can build
+    it once per chunk and share it.
+
+    Pairs are keyed by the native-endian unsigned short made up of the two
+    bytes, which lets us count them at C speed.
+    """
+
+    def __init__(self, byte_str: Union[bytes, bytearray]) -> None:
+        length = len(byte_str)
+        self.first_byte = byte_str[0] if length else 0
+        self.last_byte = byte_str[-1] if length else 0
+        # Counting the pairs starting at even offsets and then the ones
+        # starting at odd offsets covers every adjacent pair exactly once.
+        view = memoryview(byte_str)
+        self.pair_counts = Counter(view[: length - length % 2].cast("H"))
+        if length > 1:
+            self.pair_counts.update(view[1 : length - (length - 1) % 2].cast("H"))
+        # Every byte but the last starts exactly one pair, and there are far
+        # fewer distinct pairs than bytes, so this is much quicker than
+        # counting the bytes themselves.
+        self.byte_counts: "Counter[int]" = Counter()
+        first_byte_shift = 0 if sys.byteorder == "little" else 8
+        for pair, count in self.pair_counts.items():
+            self.byte_counts[(pair >> first_byte_shift) & 0xFF] += count
+        if length:
+            self.byte_counts[self.last_byte] += 1
+
+
+class CompactSingleByteCharSetModel(NamedTuple):
+    """
+    A ``SingleByteCharSetModel`` packed into flat tables, which is what
+    ``SingleByteCharSetProber`` actually uses.
+
+    ``order_table`` holds the order of each of the 256 byte values, and
+    ``language_model`` holds the ``SequenceLikelihood`` of order ``second``
+    following order ``first`` at index ``first * SAMPLE_SIZE + second``.
+    """
+
+    charset_name: str
+    language: str
+    order_table: bytes
+    language_model: bytes
+    typical_positive_ratio: float
+    keep_ascii_letters: bool
+    alphabet: str
+
+    @classmethod
+    def from_model(
+        cls, model: SingleByteCharSetModel
+    ) -> "CompactSingleByteCharSetModel":
+        sample_size = SingleByteCharSetProber.SAMPLE_SIZE
+        order_table = bytes(
+            model.char_to_order_map.get(char, CharacterCategory.UNDEFINED)
+            for char in range(256)
+        )
+        language_model = bytes(
+            model.language_model.get(first, {}).get(second, SequenceLikelihood.NEGATIVE)
+            for first in range(sample_size)
+            for second in range(sample_size)
+        )
+        return cls(
+            charset_name=model.charset_name,
+            language=model.language,
+            order_table=order_table,
+            language_model=language_model,
+            typical_positive_ratio=model.typical_positive_ratio,
+            keep_ascii_letters=model.keep_ascii_letters,
+            alphabet=model.alphabet,
+        )
+
+
+# Converted models, keyed on the id() of the original (which is unhashable).
+# The original is kept alongside so that its id cannot be reused.
+_COMPACT_MODELS: Dict[
+    int, Tuple[SingleByteCharSetModel, CompactSingleByteCharSetModel]
+] = {}
+
+
+def compact_model(
+    model: Union[SingleByteCharSetModel, CompactSingleByteCharSetModel],
+) -> CompactSingleByteCharSetModel:
+    """
+    Returns the compact form of ``model``, converting it only the first time
+    it is asked for.
+    """
+    if isinstance(model, CompactSingleByteCharSetModel):
+        return model
+    if id(model) not in _COMPACT_MODELS:
+        _COMPACT_MODELS[id(model)] = (
+            model,
+            CompactSingleByteCharSetModel.from_model(model),
+        )
+    return _COMPACT_MODELS[id(model)][1]
+
+
+# Marks pairs in a pair table that are not sequences of two frequent letters
+NO_SEQUENCE = 255
+
+
+@lru_cache(maxsize=None)
+def get_pair_table(
+    model: CompactSingleByteCharSetModel, is_reversed: bool = False
+) -> bytes:
+    """
+    Returns a table mapping each native-endian byte pair key (see
+    ``ByteHistogram``) to the ``SequenceLikelihood`` of that pair in ``model``,
+    or ``NO_SEQUENCE`` if either byte is outside the model's sample.  If
+    ``is_reversed`` is set, pairs are looked up in the model back to front.
+
+    Tables are cached, since every prober using a model needs the same one.
+    """
+    sample_size = SingleByteCharSetProber.SAMPLE_SIZE
+    no_sequence_row = bytes([NO_SEQUENCE]) * 256
+    out_of_sample = bytes([NO_SEQUENCE]) * (256 - sample_size)
+    rows = []
+    for first_order in model.order_table:
+        if first_order >= sample_size:
+            rows.append(no_sequence_row)
+            continue
+        # Likelihood of every possible order following first_order, which
+        # translate turns into the likelihood of every following byte.
+        start = first_order * sample_size
+        likelihoods = model.language_model[start : start + sample_size]
+        rows.append(model.order_table.translate(likelihoods + out_of_sample))
+    # Row-major order matches big-endian pair keys.  Swapping the two bytes
+    # of the key is the same as transposing the table.
+    pair_table = b"".join(rows)
+    if is_reversed != (sys.byteorder == "little"):
+        pair_table = b"".join(pair_table[i::256] for i in range(256))
+    return pair_table
+
+
 class SingleByteCharSetProber(CharSetProber):
     SAMPLE_SIZE = 64
     SB_ENOUGH_REL_THRESHOLD = 1024  # 0.25 * SAMPLE_SIZE^2
@@ -49,12 +189,12 @@ class SingleByteCharSetProber(CharSetProber):
 
     def __init__(
         self,
-        model: SingleByteCharSetModel,
+        model: Union[SingleByteCharSetModel, CompactSingleByteCharSetModel],
         is_reversed: bool = False,
         name_prober: Optional[CharSetProber] = None,
     ) -> None:
         super().__init__()
-        self._model = model
+        self._model = compact_model(model)
         # TRUE if we need to reverse every pair in the model lookup
         self._reversed = is_reversed
         # Optional auxiliary prober for name decision
@@ -65,6 +205,8 @@ class SingleByteCharSetProber(CharSetProber):
         self._total_char = 0
         self._control_char = 0
         self._freq_char = 0
+        self._pair_table = get_pair_table(self._model, is_reversed)
+        self._prefilter = self.new_prefilter()
         self.reset()
 
     def reset(self) -> None:
@@ -77,6 +219,11 @@ class SingleByteCharSetProber(CharSetProber):
         self._control_char = 0
         # characters that fall in our sampling range
         self._freq_char = 0
+        self._prefilter.reset()
+
+    def resync(self) -> None:
+        self._last_order = 255
+        self._prefilter.reset()
 
     @property
     def charset_name(self) -> Optional[str]:
@@ -90,35 +237,73 @@ class SingleByteCharSetProber(CharSetProber):
             return self._name_prober.language
         return self._model.language
 
-    def feed(self, byte_str: Union[bytes, bytearray]) -> ProbingState:
+    @property
+    def keep_ascii_letters(self) -> bool:
+        return self._model.keep_ascii_letters
+
+    def new_prefilter(self) -> TextFilter:
+        """
+        Returns a new filter of the kind that ``prefilter`` uses.  This only
+        depends on ``keep_ascii_letters``, so probers that agree on it can
+        share one filter, and its output.
+        """
         # TODO: Make filter_international_words keep things in self.alphabet
         if not self._model.keep_ascii_letters:
-            byte_str = self.filter_international_words(byte_str)
-        else:
-            byte_str = self.remove_xml_tags(byte_str)
-        if not byte_str:
+            return InternationalWordsFilter()
+        return XMLTagFilter()
+
+    def prefilter(self, byte_str: Union[bytes, bytearray, memoryview]) -> bytearray:
+        """
+        Returns the parts of ``byte_str`` that this prober should score,
+        carrying any tag or word that it ends in over to the next call.
+        """
+        return self._prefilter.filter(byte_str)
+
+    def feed(self, byte_str: Union[bytes, bytearray, memoryview]) -> ProbingState:
+        return self.feed_histogram(ByteHistogram(self.prefilter(byte_str)))
+
+    def feed_histogram(self, histogram: ByteHistogram) -> ProbingState:
+        """
+        Like ``feed``, but for input that has already been run through
+        ``prefilter`` and counted up in a ``ByteHistogram``.
+        """
+        if not histogram.byte_counts:
             return self.state
-        char_to_order_map = self._model.char_to_order_map
-        language_model = self._model.language_model
-        for char in byte_str:
-            order = char_to_order_map.get(char, CharacterCategory.UNDEFINED)
-            # XXX: This was SYMBOL_CAT_ORDER before, with a value of 250, but
-            #      CharacterCategory.SYMBOL is actually 253, so we use CONTROL
-            #      to make it closer to the original intent. The only difference
-            #      is whether or not we count digits and control characters for
-            #      _total_char purposes.
+        order_table = self._model.order_table
+        # XXX: This was SYMBOL_CAT_ORDER before, with a value of 250, but
+        #      CharacterCategory.SYMBOL is actually 253, so we use CONTROL
+        #      to make it closer to the original intent. The only difference
+        #      is whether or not we count digits and control characters for
+        #      _total_char purposes.
+        for char, count in histogram.byte_counts.items():
+            order = order_table[char]
             if order < CharacterCategory.CONTROL:
-                self._total_char += 1
+                self._total_char += count
             if order < self.SAMPLE_SIZE:
-                self._freq_char += 1
-                if self._last_order < self.SAMPLE_SIZE:
-                    self._total_seqs += 1
-                    if not self._reversed:
-                        lm_cat = language_model[self._last_order][order]
-                    else:
-                        lm_cat = language_model[order][self._last_order]
-                    self._seq_counters[lm_cat] += 1
-            self._last_order = order
+                self._freq_char += count
+
+        # The pair straddling the previous chunk and this one
+        order = order_table[histogram.first_byte]
+        if order < self.SAMPLE_SIZE and self._last_order < self.SAMPLE_SIZE:
+            self._total_seqs += 1
+            if not self._reversed:
+                lm_cat = self._model.language_model[
+                    self._last_order * self.SAMPLE_SIZE + order
+                ]
+            else:
+                lm_cat = self._model.language_model[
+                    order * self.SAMPLE_SIZE + self._last_order
+                ]
+            self._seq_counters[lm_cat] += 1
+        self._last_order = order_table[histogram.last_byte]
+
+        pair_table = self._pair_table
+        seq_counters = self._seq_counters
+        for pair, count in histogram.pair_counts.items():
+            lm_cat = pair_table[pair]
+            if lm_cat != NO_SEQUENCE:
+                seq_counters[lm_cat] += count
+                self._total_seqs += count
 
         charset_name = self._model.charset_name
         if self.state == ProbingState.DETECTING:
@@ -25,63 +25,139 @@
 # <https://www.gnu.org/licenses/>.
 ######################### END LICENSE BLOCK #########################
 
+from typing import Dict, List, Optional, Union
+
 from .charsetgroupprober import CharSetGroupProber
+from .charsetprober import CharSetProber
+from .encodingfilter import EncodingFilter
+from .enums import LanguageFilter, ProbingState
 from .hebrewprober import HebrewProber
-from .langbulgarianmodel import ISO_8859_5_BULGARIAN_MODEL, WINDOWS_1251_BULGARIAN_MODEL
-from .langgreekmodel import ISO_8859_7_GREEK_MODEL, WINDOWS_1253_GREEK_MODEL
-from .langhebrewmodel import WINDOWS_1255_HEBREW_MODEL
-
-# from .langhungarianmodel import (ISO_8859_2_HUNGARIAN_MODEL,
-#                                  WINDOWS_1250_HUNGARIAN_MODEL)
-from .langrussianmodel import (
-    IBM855_RUSSIAN_MODEL,
-    IBM866_RUSSIAN_MODEL,
-    ISO_8859_5_RUSSIAN_MODEL,
-    KOI8_R_RUSSIAN_MODEL,
-    MACCYRILLIC_RUSSIAN_MODEL,
-    WINDOWS_1251_RUSSIAN_MODEL,
-)
-from .langthaimodel import TIS_620_THAI_MODEL
-from .langturkishmodel import ISO_8859_9_TURKISH_MODEL
-from .sbcharsetprober import SingleByteCharSetProber
+from .sbcharsetprober import ByteHistogram, SingleByteCharSetProber
+from .textfilter import TextFilter
 
 
 class SBCSGroupProber(CharSetGroupProber):
-    def __init__(self) -> None:
-        super().__init__()
-        hebrew_prober = HebrewProber()
-        logical_hebrew_prober = SingleByteCharSetProber(
-            WINDOWS_1255_HEBREW_MODEL, is_reversed=False, name_prober=hebrew_prober
-        )
-        # TODO: See if using ISO-8859-8 Hebrew model works better here, since
-        #       it's actually the visual one
-        visual_hebrew_prober = SingleByteCharSetProber(
-            WINDOWS_1255_HEBREW_MODEL, is_reversed=True, name_prober=hebrew_prober
+    def __init__(
+        self,
+        lang_filter: LanguageFilter = LanguageFilter.NON_CJK,
+        encoding_filter: Optional[EncodingFilter] = None,
+    ) -> None:
+        # The language models are big, so only load them once we know that we
+        # need them, rather than whenever chardet is imported.  They come from
+        # the binary tables that build_binary_tables.py generates from the
+        # lang*model modules, which load much faster.
+        from .sbcsmodels import (
+            IBM855_RUSSIAN_MODEL,
+            IBM866_RUSSIAN_MODEL,
+            ISO_8859_5_BULGARIAN_MODEL,
+            ISO_8859_5_RUSSIAN_MODEL,
+            ISO_8859_7_GREEK_MODEL,
+            ISO_8859_9_TURKISH_MODEL,
+            KOI8_R_RUSSIAN_MODEL,
+            MACCYRILLIC_RUSSIAN_MODEL,
+            TIS_620_THAI_MODEL,
+            WINDOWS_1251_BULGARIAN_MODEL,
+            WINDOWS_1251_RUSSIAN_MODEL,
+            WINDOWS_1253_GREEK_MODEL,
+            WINDOWS_1255_HEBREW_MODEL,
         )
-        hebrew_prober.set_model_probers(logical_hebrew_prober, visual_hebrew_prober)
+
+        # ISO_8859_2_HUNGARIAN_MODEL and WINDOWS_1250_HUNGARIAN_MODEL are
+        # available too, but are not used yet.
+        super().__init__(lang_filter=lang_filter)
+        # Histograms of the filtered chunk currently being fed, keyed by
+        # keep_ascii_letters, so that each filter runs once per chunk
+        self._histograms: Dict[bool, ByteHistogram] = {}
+        # The filters those chunks go through, with the same keys.  They keep
+        # track of where the last chunk left off, so they belong to the group
+        # rather than to whichever prober happens to be fed first.
+        self._prefilters: Dict[bool, TextFilter] = {}
         # TODO: ORDER MATTERS HERE. I changed the order vs what was in master
         #       and several tests failed that did not before. Some thought
         #       should be put into the ordering, and we should consider making
         #       order not matter here, because that is very counter-intuitive.
-        self.probers = [
-            SingleByteCharSetProber(WINDOWS_1251_RUSSIAN_MODEL),
-            SingleByteCharSetProber(KOI8_R_RUSSIAN_MODEL),
-            SingleByteCharSetProber(ISO_8859_5_RUSSIAN_MODEL),
-            SingleByteCharSetProber(MACCYRILLIC_RUSSIAN_MODEL),
-            SingleByteCharSetProber(IBM866_RUSSIAN_MODEL),
-            SingleByteCharSetProber(IBM855_RUSSIAN_MODEL),
-            SingleByteCharSetProber(ISO_8859_7_GREEK_MODEL),
-            SingleByteCharSetProber(WINDOWS_1253_GREEK_MODEL),
-            SingleByteCharSetProber(ISO_8859_5_BULGARIAN_MODEL),
-            SingleByteCharSetProber(WINDOWS_1251_BULGARIAN_MODEL),
+        models = [
+            WINDOWS_1251_RUSSIAN_MODEL,
+            KOI8_R_RUSSIAN_MODEL,
+            ISO_8859_5_RUSSIAN_MODEL,
+            MACCYRILLIC_RUSSIAN_MODEL,
+            IBM866_RUSSIAN_MODEL,
+            IBM855_RUSSIAN_MODEL,
+            ISO_8859_7_GREEK_MODEL,
+            WINDOWS_1253_GREEK_MODEL,
+            ISO_8859_5_BULGARIAN_MODEL,
+            WINDOWS_1251_BULGARIAN_MODEL,
             # TODO: Restore Hungarian encodings (iso-8859-2 and windows-1250)
             #       after we retrain model.
-            # SingleByteCharSetProber(ISO_8859_2_HUNGARIAN_MODEL),
-            # SingleByteCharSetProber(WINDOWS_1250_HUNGARIAN_MODEL),
-            SingleByteCharSetProber(TIS_620_THAI_MODEL),
-            SingleByteCharSetProber(ISO_8859_9_TURKISH_MODEL),
-            hebrew_prober,
-            logical_hebrew_prober,
-            visual_hebrew_prober,
+            # ISO_8859_2_HUNGARIAN_MODEL,
+            # WINDOWS_1250_HUNGARIAN_MODEL,
+            TIS_620_THAI_MODEL,
+            ISO_8859_9_TURKISH_MODEL,
+        ]
+        probers: List[CharSetProber] = [
+            SingleByteCharSetProber(model)
+            for model in models
+            if self._allows_language(model.language)
+            and (encoding_filter is None or encoding_filter.allows(model.charset_name))
         ]
+        if self._allows_language("Hebrew") and (
+            encoding_filter is None
+            or encoding_filter.allows(
+                HebrewProber.LOGICAL_HEBREW_NAME, HebrewProber.VISUAL_HEBREW_NAME
+            )
+        ):
+            hebrew_prober = HebrewProber()
+            logical_hebrew_prober = SingleByteCharSetProber(
+                WINDOWS_1255_HEBREW_MODEL, is_reversed=False, name_prober=hebrew_prober
+            )
+            # TODO: See if using ISO-8859-8 Hebrew model works better here,
+            #       since it's actually the visual one
+            visual_hebrew_prober = SingleByteCharSetProber(
+                WINDOWS_1255_HEBREW_MODEL, is_reversed=True, name_prober=hebrew_prober
+            )
+            hebrew_prober.set_model_probers(logical_hebrew_prober, visual_hebrew_prober)
+            probers.extend([hebrew_prober, logical_hebrew_prober, visual_hebrew_prober])
+        self.probers = probers
         self.reset()
+
+    def _allows_language(self, language: str) -> bool:
+        # NON_CJK allows every language, the other flags only their own
+        return bool(
+            self.lang_filter
+            & (LanguageFilter.NON_CJK | LanguageFilter.for_language(language))
+        )
+
+    def reset(self) -> None:
+        super().reset()
+        for prefilter in self._prefilters.values():
+            prefilter.reset()
+
+    def resync(self) -> None:
+        super().resync()
+        for prefilter in self._prefilters.values():
+            prefilter.reset()
+
+    def feed(self, byte_str: Union[bytes, bytearray, memoryview]) -> ProbingState:
+        try:
+            return super().feed(byte_str)
+        finally:
+            self._histograms.clear()
+
+    def _feed_prober(
+        self, prober: CharSetProber, byte_str: Union[bytes, bytearray, memoryview]
+    ) -> ProbingState:
+        if not isinstance(prober, SingleByteCharSetProber):
+            return prober.feed(byte_str)
+        # All of our single-byte probers filter their input in one of only two
+        # ways, and only need the byte and byte pair counts of what is left, so
+        # work those out once per chunk and share them between the probers.
+        keep_ascii_letters = prober.keep_ascii_letters
+        histogram = self._histograms.get(keep_ascii_letters)
+        if histogram is None:
+            prefilter = self._prefilters.get(keep_ascii_letters)
+            if prefilter is None:
+                prefilter = prober.new_prefilter()
+                self._prefilters[keep_ascii_letters] = prefilter
+            histogram = ByteHistogram(prefilter.filter(byte_str))
+            self._histograms[keep_ascii_letters] = histogram
+        return prober.feed_histogram(histogram)
@@ -0,0 +1,176 @@
+######################## BEGIN LICENSE BLOCK ########################
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, see
+# <https://www.gnu.org/licenses/>.
+######################### END LICENSE BLOCK #########################
+"""
+The single-byte language models, in their compact form.
+
+This file was generated by build_binary_tables.py from langbulgarianmodel.py, langgreekmodel.py, langhebrewmodel.py, langhungarianmodel.py, langrussianmodel.py, langthaimodel.py, langturkishmodel.py.
+Do not edit it by hand; edit those and rerun the script instead.
+"""
+
+from .binarytables import BinaryTables
+from .sbcharsetprober import CompactSingleByteCharSetModel
+
+_TABLES = BinaryTables.load("sbcsmodels.bin")
+
+ISO_8859_5_BULGARIAN_MODEL = CompactSingleByteCharSetModel(
+    charset_name="ISO-8859-5",
+    language="Bulgarian",
+    order_table=_TABLES.get_bytes("ISO_8859_5_BULGARIAN_CHAR_TO_ORDER"),
+    language_model=_TABLES.get_bytes("BULGARIAN_LANG_MODEL"),
+    typical_positive_ratio=0.969392,
+    keep_ascii_letters=False,
+    alphabet="АБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЬЮЯабвгдежзийклмнопрстуфхцчшщъьюя",
+)
+
+WINDOWS_1251_BULGARIAN_MODEL = CompactSingleByteCharSetModel(
+    charset_name="windows-1251",
+    language="Bulgarian",
+    order_table=_TABLES.get_bytes("WINDOWS_1251_BULGARIAN_CHAR_TO_ORDER"),
+    language_model=_TABLES.get_bytes("BULGARIAN_LANG_MODEL"),
+    typical_positive_ratio=0.969392,
+    keep_ascii_letters=False,
+    alphabet="АБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЬЮЯабвгдежзийклмнопрстуфхцчшщъьюя",
+)
+
+WINDOWS_1253_GREEK_MODEL = CompactSingleByteCharSetModel(
+    charset_name="windows-1253",
+    language="Greek",
+    order_table=_TABLES.get_bytes("WINDOWS_1253_GREEK_CHAR_TO_ORDER"),
+    language_model=_TABLES.get_bytes("GREEK_LANG_MODEL"),
+    typical_positive_ratio=0.982851,
+    keep_ascii_letters=False,
+    alphabet="ΆΈΉΊΌΎΏΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩάέήίαβγδεζηθικλμνξοπρςστυφχψωόύώ",
+)
+
+ISO_8859_7_GREEK_MODEL = CompactSingleByteCharSetModel(
+    charset_name="ISO-8859-7",
+    language="Greek",
+    order_table=_TABLES.get_bytes("ISO_8859_7_GREEK_CHAR_TO_ORDER"),
+    language_model=_TABLES.get_bytes("GREEK_LANG_MODEL"),
+    typical_positive_ratio=0.982851,
+    keep_ascii_letters=False,
+    alphabet="ΆΈΉΊΌΎΏΑΒΓΔΕΖΗΘΙΚΛΜΝΞΟΠΡΣΤΥΦΧΨΩάέήίαβγδεζηθικλμνξοπρςστυφχψωόύώ",
+)
+
+WINDOWS_1255_HEBREW_MODEL = CompactSingleByteCharSetModel(
+    charset_name="windows-1255",
+    language="Hebrew",
+    order_table=_TABLES.get_bytes("WINDOWS_1255_HEBREW_CHAR_TO_ORDER"),
+    language_model=_TABLES.get_bytes("HEBREW_LANG_MODEL"),
+    typical_positive_ratio=0.984004,
+    keep_ascii_letters=False,
+    alphabet="אבגדהוזחטיךכלםמןנסעףפץצקרשתװױײ",
+)
+
+WINDOWS_1250_HUNGARIAN_MODEL = CompactSingleByteCharSetModel(
+    charset_name="windows-1250",
+    language="Hungarian",
+    order_table=_TABLES.get_bytes("WINDOWS_1250_HUNGARIAN_CHAR_TO_ORDER"),
+    language_model=_TABLES.get_bytes("HUNGARIAN_LANG_MODEL"),
+    typical_positive_ratio=0.947368,
+    keep_ascii_letters=True,
+    alphabet="ABCDEFGHIJKLMNOPRSTUVZabcdefghijklmnoprstuvzÁÉÍÓÖÚÜáéíóöúüŐőŰű",
+)
+
+ISO_8859_2_HUNGARIAN_MODEL = CompactSingleByteCharSetModel(
+    charset_name="ISO-8859-2",
+    language="Hungarian",
+    order_table=_TABLES.get_bytes("ISO_8859_2_HUNGARIAN_CHAR_TO_ORDER"),
+    language_model=_TABLES.get_bytes("HUNGARIAN_LANG_MODEL"),
+    typical_positive_ratio=0.947368,
+    keep_ascii_letters=True,
+    alphabet="ABCDEFGHIJKLMNOPRSTUVZabcdefghijklmnoprstuvzÁÉÍÓÖÚÜáéíóöúüŐőŰű",
+)
+
+IBM866_RUSSIAN_MODEL = CompactSingleByteCharSetModel(
+    charset_name="IBM866",
+    language="Russian",
+    order_table=_TABLES.get_bytes("IBM866_RUSSIAN_CHAR_TO_ORDER"),
+    language_model=_TABLES.get_bytes("RUSSIAN_LANG_MODEL"),
+    typical_positive_ratio=0.976601,
+    keep_ascii_letters=False,
+    alphabet="ЁАБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯабвгдежзийклмнопрстуфхцчшщъыьэюяё",
+)
+
+WINDOWS_1251_RUSSIAN_MODEL = CompactSingleByteCharSetModel(
+    charset_name="windows-1251",
+    language="Russian",
+    order_table=_TABLES.get_bytes("WINDOWS_1251_RUSSIAN_CHAR_TO_ORDER"),
+    language_model=_TABLES.get_bytes("RUSSIAN_LANG_MODEL"),
+    typical_positive_ratio=0.976601,
+    keep_ascii_letters=False,
+    alphabet="ЁАБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯабвгдежзийклмнопрстуфхцчшщъыьэюяё",
+)
+
+IBM855_RUSSIAN_MODEL = CompactSingleByteCharSetModel(
+    charset_name="IBM855",
+    language="Russian",
+    order_table=_TABLES.get_bytes("IBM855_RUSSIAN_CHAR_TO_ORDER"),
+    language_model=_TABLES.get_bytes("RUSSIAN_LANG_MODEL"),
+    typical_positive_ratio=0.976601,
+    keep_ascii_letters=False,
+    alphabet="ЁАБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯабвгдежзийклмнопрстуфхцчшщъыьэюяё",
+)
+
+KOI8_R_RUSSIAN_MODEL = CompactSingleByteCharSetModel(
+    charset_name="KOI8-R",
+    language="Russian",
+    order_table=_TABLES.get_bytes("KOI8_R_RUSSIAN_CHAR_TO_ORDER"),
+    language_model=_TABLES.get_bytes("RUSSIAN_LANG_MODEL"),
+    typical_positive_ratio=0.976601,
+    keep_ascii_letters=False,
+    alphabet="ЁАБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯабвгдежзийклмнопрстуфхцчшщъыьэюяё",
+)
+
+MACCYRILLIC_RUSSIAN_MODEL = CompactSingleByteCharSetModel(
+    charset_name="MacCyrillic",
+    language="Russian",
+    order_table=_TABLES.get_bytes("MACCYRILLIC_RUSSIAN_CHAR_TO_ORDER"),
+    language_model=_TABLES.get_bytes("RUSSIAN_LANG_MODEL"),
+    typical_positive_ratio=0.976601,
+    keep_ascii_letters=False,
+    alphabet="ЁАБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯабвгдежзийклмнопрстуфхцчшщъыьэюяё",
+)
+
+ISO_8859_5_RUSSIAN_MODEL = CompactSingleByteCharSetModel(
+    charset_name="ISO-8859-5",
+    language="Russian",
+    order_table=_TABLES.get_bytes("ISO_8859_5_RUSSIAN_CHAR_TO_ORDER"),
+    language_model=_TABLES.get_bytes("RUSSIAN_LANG_MODEL"),
+    typical_positive_ratio=0.976601,
+    keep_ascii_letters=False,
+    alphabet="ЁАБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯабвгдежзийклмнопрстуфхцчшщъыьэюяё",
+)
+
+TIS_620_THAI_MODEL = CompactSingleByteCharSetModel(
+    charset_name="TIS-620",
+    language="Thai",
+    order_table=_TABLES.get_bytes("TIS_620_THAI_CHAR_TO_ORDER"),
+    language_model=_TABLES.get_bytes("THAI_LANG_MODEL"),
+    typical_positive_ratio=0.926386,
+    keep_ascii_letters=False,
+    alphabet="กขฃคฅฆงจฉชซฌญฎฏฐฑฒณดตถทธนบปผฝพฟภมยรฤลฦวศษสหฬอฮฯะัาำิีึืฺุู฿เแโใไๅๆ็่้๊๋์ํ๎๏๐๑๒๓๔๕๖๗๘๙๚๛",
+)
+
+ISO_8859_9_TURKISH_MODEL = CompactSingleByteCharSetModel(
+    charset_name="ISO-8859-9",
+    language="Turkish",
+    order_table=_TABLES.get_bytes("ISO_8859_9_TURKISH_CHAR_TO_ORDER"),
+    language_model=_TABLES.get_bytes("TURKISH_LANG_MODEL"),
+    typical_positive_ratio=0.97029,
+    keep_ascii_letters=True,
+    alphabet="ABCDEFGHIJKLMNOPRSTUVYZabcdefghijklmnoprstuvyzÂÇÎÖÛÜâçîöûüĞğİıŞş",
+)
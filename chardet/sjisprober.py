@@ -24,11 +24,11 @@
 # <https://www.gnu.org/licenses/>.
 ######################### END LICENSE BLOCK #########################
 
-from typing import Union
+from typing import List, Union
 
 from .chardistribution import SJISDistributionAnalysis
 from .codingstatemachine import CodingStateMachine
-from .enums import MachineState, ProbingState
+from .enums import ProbingState
 from .jpcntx import SJISContextAnalysis
 from .mbcharsetprober import MultiByteCharSetProber
 from .mbcssm import SJIS_SM_MODEL
@@ -46,6 +46,10 @@ class SJISProber(MultiByteCharSetProber):
         super().reset()
         self.context_analyzer.reset()
 
+    def resync(self) -> None:
+        super().resync()
+        self.context_analyzer.resync()
+
     @property
     def charset_name(self) -> str:
         return self.context_analyzer.charset_name
@@ -54,36 +58,27 @@ class SJISProber(MultiByteCharSetProber):
     def language(self) -> str:
         return "Japanese"
 
-    def feed(self, byte_str: Union[bytes, bytearray]) -> ProbingState:
-        assert self.coding_sm is not None
+    def feed_chars(
+        self,
+        byte_str: Union[bytes, bytearray, memoryview],
+        stop: int,
+        char_ends: List[int],
+        char_lens: List[int],
+    ) -> ProbingState:
         assert self.distribution_analyzer is not None
+        self._check_stop(byte_str, stop)
 
-        for i, byte in enumerate(byte_str):
-            coding_state = self.coding_sm.next_state(byte)
-            if coding_state == MachineState.ERROR:
-                self.logger.debug(
-                    "%s %s prober hit error at byte %s",
-                    self.charset_name,
-                    self.language,
-                    i,
-                )
-                self._state = ProbingState.NOT_ME
-                break
-            if coding_state == MachineState.ITS_ME:
-                self._state = ProbingState.FOUND_IT
-                break
-            if coding_state == MachineState.START:
-                char_len = self.coding_sm.get_current_charlen()
-                if i == 0:
-                    self._last_char[1] = byte
-                    self.context_analyzer.feed(
-                        self._last_char[2 - char_len :], char_len
-                    )
+        for i, char_len in zip(char_ends, char_lens):
+            if i == 0:
+                self._last_char[1] = byte_str[0]
+                self.context_analyzer.feed(self._last_char[2 - char_len :], char_len)
+                if char_len == 2:
                     self.distribution_analyzer.feed(self._last_char, char_len)
-                else:
-                    self.context_analyzer.feed(
-                        byte_str[i + 1 - char_len : i + 3 - char_len], char_len
-                    )
+            else:
+                self.context_analyzer.feed(
+                    byte_str[i + 1 - char_len : i + 3 - char_len], char_len
+                )
+                if char_len == 2:
                     self.distribution_analyzer.feed(byte_str[i - 1 : i + 1], char_len)
 
         self._last_char[0] = byte_str[-1]
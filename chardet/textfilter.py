@@ -0,0 +1,147 @@
+######################## BEGIN LICENSE BLOCK ########################
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, see
+# <https://www.gnu.org/licenses/>.
+######################### END LICENSE BLOCK #########################
+"""
+Filters that probers run their input through before scoring it, which keep
+track of where the previous chunk left off.
+
+``CharSetProber.remove_xml_tags`` and
+``CharSetProber.filter_international_words`` look at one chunk at a time, so a
+tag or word that is split between two chunks is filtered as if it were two.
+The filters here carry an open tag or a partial word over to the next chunk,
+so that feeding a document in chunks of any size gives (almost, see the
+filters themselves) the same result as feeding all of it at once.
+"""
+
+import re
+from typing import Union
+
+from .charsetprober import MARKERS_TO_SPACES, CharSetProber
+
+ASCII_LETTERS = bytes(range(0x41, 0x5B)) + bytes(range(0x61, 0x7B))
+# Everything filter_international_words does not count as a marker
+WORD_BYTES = ASCII_LETTERS + bytes(range(0x80, 0x100))
+MARKER_PATTERN = re.compile(b"[^a-zA-Z\x80-\xff]")
+# How many letters InternationalWordsFilter holds back at most
+MAX_PENDING_LETTERS = 64
+
+
+class TextFilter:
+    """
+    The base class for filters.  Call ``filter`` with each chunk of the
+    document in turn, and ``reset`` before a chunk that does not directly
+    follow the previous one.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        pass
+
+    def filter(self, buf: Union[bytes, bytearray, memoryview]) -> bytearray:
+        raise NotImplementedError
+
+
+class XMLTagFilter(TextFilter):
+    """
+    Like ``CharSetProber.remove_xml_tags``, for a chunk at a time.
+
+    The one difference is text that is followed by a stray ``>`` rather than
+    by a tag.  ``remove_xml_tags`` drops it, but the part of it in earlier
+    chunks has already been kept by then.  Holding text back until it is
+    clear which way it goes would mean holding back all of a document without
+    tags.
+    """
+
+    def reset(self) -> None:
+        # Whether the input so far ends inside a tag
+        self._in_tag = False
+        # Whether it ends with text after the last tag, which remove_xml_tags
+        # keeps without the space that would delimit it from the next tag
+        self._in_text = False
+
+    def filter(self, buf: Union[bytes, bytearray, memoryview]) -> bytearray:
+        buf = bytes(buf)
+        filtered = bytearray()
+        if self._in_tag:
+            tag_end = buf.find(b">")
+            if tag_end < 0:
+                return filtered
+            buf = buf[tag_end + 1 :]
+            self._in_tag = False
+        elif self._in_text and buf[:1] == b"<":
+            # All of the text before this tag was in earlier chunks
+            filtered += b" "
+        filtered += CharSetProber.remove_xml_tags(buf)
+
+        tag_start = buf.rfind(b"<")
+        tag_end = buf.rfind(b">")
+        if tag_start > tag_end:
+            self._in_tag = True
+            self._in_text = False
+        elif tag_end >= 0:
+            self._in_text = tag_end + 1 < len(buf)
+        elif buf:
+            self._in_text = True
+        return filtered
+
+
+class InternationalWordsFilter(TextFilter):
+    """
+    Like ``CharSetProber.filter_international_words``, for a chunk at a time.
+
+    The letters at the end of a chunk are held back in case the word they are
+    in turns out to have an international character in it.  Only the last
+    ``MAX_PENDING_LETTERS`` of them are, so that a long run of letters does
+    not pile up, which means that a word longer than that loses its start if
+    it is split between chunks.
+    """
+
+    def reset(self) -> None:
+        # Whether the input so far ends in a word with an international
+        # character in it, which is kept no matter how the word goes on
+        self._in_word = False
+        # The letters the input so far ends with, if the word they are in has
+        # no international characters yet
+        self._pending_letters = bytearray()
+
+    def filter(self, buf: Union[bytes, bytearray, memoryview]) -> bytearray:
+        buf = bytes(buf)
+        filtered = bytearray()
+        if self._in_word:
+            marker = MARKER_PATTERN.search(buf)
+            if marker is None:
+                return bytearray(buf)
+            filtered += buf[: marker.end()].translate(MARKERS_TO_SPACES)
+            buf = buf[marker.end() :]
+            self._in_word = False
+        elif self._pending_letters:
+            if not buf.translate(None, ASCII_LETTERS):
+                # Still no idea whether the word will be kept
+                self._pending_letters += buf
+                del self._pending_letters[:-MAX_PENDING_LETTERS]
+                return filtered
+            buf = bytes(self._pending_letters) + buf
+            self._pending_letters = bytearray()
+        filtered += CharSetProber.filter_international_words(buf)
+
+        word = buf[len(buf.rstrip(WORD_BYTES)) :]
+        if word.translate(None, ASCII_LETTERS):
+            # filter_international_words has already kept what there is of it
+            self._in_word = True
+        else:
+            self._pending_letters += word[-MAX_PENDING_LETTERS:]
+        return filtered
@@ -37,18 +37,31 @@ class a user of ``chardet`` should use.
 import codecs
 import logging
 import re
-from typing import List, Optional, Union
+from mmap import mmap
+from typing import Iterable, Iterator, List, Optional, Union
 
 from .charsetgroupprober import CharSetGroupProber
 from .charsetprober import CharSetProber
+from .encodingfilter import EncodingFilter
 from .enums import InputState, LanguageFilter, ProbingState
 from .escprober import EscCharSetProber
-from .latin1prober import Latin1Prober
-from .macromanprober import MacRomanProber
 from .mbcsgroupprober import MBCSGroupProber
 from .resultdict import ResultDict
 from .sbcsgroupprober import SBCSGroupProber
 from .utf1632prober import UTF1632Prober
+from .westerngroupprober import WesternGroupProber
+
+
+def as_byte_view(byte_str: Union[bytes, bytearray, memoryview, mmap]) -> memoryview:
+    """
+    Returns a flat view of the bytes of ``byte_str``, which can be sliced
+    without copying anything.  Only buffers that are not contiguous (such as
+    ``memoryview(data)[::2]``) are copied, since they cannot be viewed flat.
+    """
+    view = memoryview(byte_str)
+    if not view.c_contiguous:
+        view = memoryview(view.tobytes())
+    return view.cast("B")
 
 
 class UniversalDetector:
@@ -66,12 +79,32 @@ class UniversalDetector:
             u.close()
             detected = u.result
 
+    If you only care about some encodings, pass them as ``encodings`` (or the
+    ones you do not care about as ``exclude_encodings``), and only the probers
+    that can answer with one of them are created and fed.  Encodings that are
+    certain from a BOM, and ``ascii`` for pure ASCII input, are still reported
+    either way.
+
+    With ``codec_prescreen``, the multi-byte probers are ruled out as soon as
+    Python's codec for their encoding fails to decode the input, which is
+    faster but can give different results (see ``MBCSGroupProber``).
+
     """
 
     MINIMUM_THRESHOLD = 0.20
+    UTF1632_NAMES = ("utf-16be", "utf-16le", "utf-32be", "utf-32le")
+    # Inputs larger than this are fed to the probers in slices of at most this
+    # many bytes, so that we can stop early once they have made up their minds.
+    MAX_SLICE_SIZE = 64 * 1024
     HIGH_BYTE_DETECTOR = re.compile(b"[\x80-\xff]")
     ESC_DETECTOR = re.compile(b"(\033|~{)")
     WIN_BYTE_DETECTOR = re.compile(b"[\x80-\x9f]")
+    # Matches up to and including the last line break it can reach
+    LAST_LINE_BREAK_DETECTOR = re.compile(b".*\n", re.DOTALL)
+    # Bytes that can never be part of a multi-byte character in any of the
+    # multi-byte encodings we support, so the probers can safely pick up
+    # again from one of them after a gap.
+    RESYNC_POINT_DETECTOR = re.compile(b"[\x00-\x2f]")
     ISO_WIN_MAP = {
         "iso-8859-1": "Windows-1252",
         "iso-8859-2": "Windows-1250",
@@ -99,10 +132,24 @@ class UniversalDetector:
         self,
         lang_filter: LanguageFilter = LanguageFilter.ALL,
         should_rename_legacy: bool = False,
+        encodings: Optional[Iterable[str]] = None,
+        exclude_encodings: Optional[Iterable[str]] = None,
+        codec_prescreen: bool = False,
     ) -> None:
+        aliases = dict(self.ISO_WIN_MAP)
+        if should_rename_legacy:
+            aliases.update(self.LEGACY_MAP)
+        self.encoding_filter = EncodingFilter(
+            encodings=encodings, exclude_encodings=exclude_encodings, aliases=aliases
+        )
+        self._use_utf1632_prober = self.encoding_filter.allows(*self.UTF1632_NAMES)
         self._esc_charset_prober: Optional[EscCharSetProber] = None
         self._utf1632_prober: Optional[UTF1632Prober] = None
         self._charset_probers: List[CharSetProber] = []
+        # The probers for high-byte input are expensive to create, so they are
+        # kept across calls to reset, but only show up in charset_probers once
+        # the current document turns out to need them.
+        self._high_byte_probers: Optional[List[CharSetProber]] = None
         self.result: ResultDict = {
             "encoding": None,
             "confidence": 0.0,
@@ -112,10 +159,13 @@ class UniversalDetector:
         self._got_data = False
         self._input_state = InputState.PURE_ASCII
         self._last_char = b""
+        self._skipped = False
+        self._needs_resync = False
         self.lang_filter = lang_filter
         self.logger = logging.getLogger(__name__)
         self._has_win_bytes = False
         self.should_rename_legacy = should_rename_legacy
+        self.codec_prescreen = codec_prescreen
         self.reset()
 
     @property
@@ -142,17 +192,21 @@ class UniversalDetector:
         self._has_win_bytes = False
         self._input_state = InputState.PURE_ASCII
         self._last_char = b""
+        self._skipped = False
+        self._needs_resync = False
         if self._esc_charset_prober:
             self._esc_charset_prober.reset()
         if self._utf1632_prober:
             self._utf1632_prober.reset()
-        for prober in self._charset_probers:
+        for prober in self._high_byte_probers or ():
             prober.reset()
+        self._charset_probers = []
 
-    def feed(self, byte_str: Union[bytes, bytearray]) -> None:
+    def feed(self, byte_str: Union[bytes, bytearray, memoryview, mmap]) -> None:
         """
         Takes a chunk of a document and feeds it through all of the relevant
-        charset probers.
+        charset probers.  The chunk is never copied, so large ``memoryview``
+        or ``mmap`` objects can be passed in directly.
 
         After calling ``feed``, you can check the value of the ``done``
         attribute to see if you need to continue feeding the
@@ -169,24 +223,27 @@ class UniversalDetector:
         if not byte_str:
             return
 
-        if not isinstance(byte_str, bytearray):
-            byte_str = bytearray(byte_str)
+        # Everything below works on a flat view of the input, so slicing it
+        # for the probers does not copy anything.
+        byte_view = as_byte_view(byte_str)
 
         # First check for known BOMs, since these are guaranteed to be correct
         if not self._got_data:
+            # A BOM only counts at the very start of the document
+            head = b"" if self._skipped else bytes(byte_view[:4])
             # If the data starts with BOM, we know it is UTF
-            if byte_str.startswith(codecs.BOM_UTF8):
+            if head.startswith(codecs.BOM_UTF8):
                 # EF BB BF  UTF-8 with BOM
                 self.result = {
                     "encoding": "UTF-8-SIG",
                     "confidence": 1.0,
                     "language": "",
                 }
-            elif byte_str.startswith((codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE)):
+            elif head.startswith((codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE)):
                 # FF FE 00 00  UTF-32, little-endian BOM
                 # 00 00 FE FF  UTF-32, big-endian BOM
                 self.result = {"encoding": "UTF-32", "confidence": 1.0, "language": ""}
-            elif byte_str.startswith(b"\xfe\xff\x00\x00"):
+            elif head.startswith(b"\xfe\xff\x00\x00"):
                 # FE FF 00 00  UCS-4, unusual octet order BOM (3412)
                 self.result = {
                     # TODO: This encoding is not supported by Python. Should remove?
@@ -194,7 +251,7 @@ class UniversalDetector:
                     "confidence": 1.0,
                     "language": "",
                 }
-            elif byte_str.startswith(b"\x00\x00\xff\xfe"):
+            elif head.startswith(b"\x00\x00\xff\xfe"):
                 # 00 00 FF FE  UCS-4, unusual octet order BOM (2143)
                 self.result = {
                     # TODO: This encoding is not supported by Python. Should remove?
@@ -202,7 +259,7 @@ class UniversalDetector:
                     "confidence": 1.0,
                     "language": "",
                 }
-            elif byte_str.startswith((codecs.BOM_LE, codecs.BOM_BE)):
+            elif head.startswith((codecs.BOM_LE, codecs.BOM_BE)):
                 # FF FE  UTF-16, little endian BOM
                 # FE FF  UTF-16, big endian BOM
                 self.result = {"encoding": "UTF-16", "confidence": 1.0, "language": ""}
@@ -215,22 +272,101 @@ class UniversalDetector:
         # If none of those matched and we've only see ASCII so far, check
         # for high bytes and escape sequences
         if self._input_state == InputState.PURE_ASCII:
-            if self.HIGH_BYTE_DETECTOR.search(byte_str):
+            if self.HIGH_BYTE_DETECTOR.search(byte_view):
                 self._input_state = InputState.HIGH_BYTE
-            elif (
-                self._input_state == InputState.PURE_ASCII
-                and self.ESC_DETECTOR.search(self._last_char + byte_str)
+            elif self.ESC_DETECTOR.search(byte_view) or (
+                # "~{" may be split between this chunk and the previous one
+                self._last_char == b"~" and byte_view[:1] == b"{"
             ):
                 self._input_state = InputState.ESC_ASCII
 
-        self._last_char = byte_str[-1:]
+        self._last_char = bytes(byte_view[-1:])
+
+        # After a gap, the probers that follow multi-byte characters have to
+        # wait for a byte that cannot be in the middle of one.  The UTF-16/32
+        # prober keeps track of its position itself, so it gets everything.
+        probe_view = byte_view
+        if self._needs_resync:
+            resync_point = self.RESYNC_POINT_DETECTOR.search(byte_view)
+            resync_start = resync_point.start() if resync_point else len(byte_view)
+            if resync_start and self._feed_utf1632_prober(byte_view[:resync_start]):
+                return
+            if resync_point:
+                self._needs_resync = False
+            probe_view = byte_view[resync_start:]
+
+        # Hand the probers bounded slices of large inputs, so that we can stop
+        # as soon as they have made a decision instead of running every prober
+        # over every byte of the input.
+        if probe_view:
+            for byte_slice in self._iter_slices(probe_view):
+                self._feed_probers(byte_slice)
+                if self.done:
+                    break
+
+        if self._input_state == InputState.HIGH_BYTE:
+            if self.WIN_BYTE_DETECTOR.search(byte_view):
+                self._has_win_bytes = True
+
+    def _iter_slices(self, byte_view: memoryview) -> Iterator[memoryview]:
+        """
+        Yields consecutive slices of ``byte_view`` that are at most
+        ``MAX_SLICE_SIZE`` bytes long.  Slices are cut right after a line break
+        where possible, so that words and tags are rarely split between them.
+        """
+        total = len(byte_view)
+        if total <= self.MAX_SLICE_SIZE:
+            yield byte_view
+            return
+        start = 0
+        while start < total:
+            end = start + self.MAX_SLICE_SIZE
+            if end < total:
+                line_break = self.LAST_LINE_BREAK_DETECTOR.match(
+                    byte_view, start + self.MAX_SLICE_SIZE // 2, end
+                )
+                if line_break:
+                    end = line_break.end()
+            yield byte_view[start:end]
+            start = end
+
+    def skip(self, num_bytes: int) -> None:
+        """
+        Tells the detector that the next ``num_bytes`` bytes of the document
+        are not going to be fed to it, so that the next chunk passed to
+        ``feed`` does not directly follow the last one.
+
+        This lets you feed a sample of a large document instead of all of it.
+        Everything the probers have learned so far is kept, but anything they
+        carried over from the end of the last chunk is dropped.
+        """
+        if self.done or num_bytes <= 0:
+            return
+        self._skipped = True
+        self._needs_resync = True
+        self._last_char = b""
+        if not self._utf1632_prober:
+            self._utf1632_prober = UTF1632Prober()
+        self._utf1632_prober.skip(num_bytes)
+        if self._esc_charset_prober:
+            self._esc_charset_prober.resync()
+        for prober in self._charset_probers:
+            prober.resync()
 
+    def _feed_utf1632_prober(self, byte_str: memoryview) -> bool:
+        """
+        Feeds a slice of input to the UTF-16/32 prober if it is still
+        undecided, and returns whether it is now sure.
+        """
         # next we will look to see if it is appears to be either a UTF-16 or
         # UTF-32 encoding
         if not self._utf1632_prober:
             self._utf1632_prober = UTF1632Prober()
 
-        if self._utf1632_prober.state == ProbingState.DETECTING:
+        if (
+            self._use_utf1632_prober
+            and self._utf1632_prober.state == ProbingState.DETECTING
+        ):
             if self._utf1632_prober.feed(byte_str) == ProbingState.FOUND_IT:
                 self.result = {
                     "encoding": self._utf1632_prober.charset_name,
@@ -238,7 +374,15 @@ class UniversalDetector:
                     "language": "",
                 }
                 self.done = True
-                return
+        return self.done
+
+    def _feed_probers(self, byte_str: memoryview) -> None:
+        """
+        Feeds a single slice of input to all of the probers that are still
+        undecided, setting ``done`` and ``result`` if one of them is sure.
+        """
+        if self._feed_utf1632_prober(byte_str):
+            return
 
         # If we've seen escape sequences, use the EscCharSetProber, which
         # uses a simple state machine to check for known escape sequences in
@@ -246,7 +390,11 @@ class UniversalDetector:
         # use such sequences.
         if self._input_state == InputState.ESC_ASCII:
             if not self._esc_charset_prober:
-                self._esc_charset_prober = EscCharSetProber(self.lang_filter)
+                self._esc_charset_prober = EscCharSetProber(
+                    self.lang_filter, self.encoding_filter
+                )
+            if self._esc_charset_prober.state != ProbingState.DETECTING:
+                return
             if self._esc_charset_prober.feed(byte_str) == ProbingState.FOUND_IT:
                 self.result = {
                     "encoding": self._esc_charset_prober.charset_name,
@@ -261,14 +409,14 @@ class UniversalDetector:
         # the multi-byte probers use a combination of character unigram and
         # bigram distributions.
         elif self._input_state == InputState.HIGH_BYTE:
-            if not self._charset_probers:
-                self._charset_probers = [MBCSGroupProber(self.lang_filter)]
-                # If we're checking non-CJK encodings, use single-byte prober
-                if self.lang_filter & LanguageFilter.NON_CJK:
-                    self._charset_probers.append(SBCSGroupProber())
-                self._charset_probers.append(Latin1Prober())
-                self._charset_probers.append(MacRomanProber())
+            if self._high_byte_probers is None:
+                self._high_byte_probers = self._create_high_byte_probers()
+            self._charset_probers = self._high_byte_probers
             for prober in self._charset_probers:
+                # Probers that have ruled themselves out cannot change their
+                # minds, so there is no point in feeding them any more data.
+                if prober.state == ProbingState.NOT_ME:
+                    continue
                 if prober.feed(byte_str) == ProbingState.FOUND_IT:
                     self.result = {
                         "encoding": prober.charset_name,
@@ -277,8 +425,22 @@ class UniversalDetector:
                     }
                     self.done = True
                     break
-            if self.WIN_BYTE_DETECTOR.search(byte_str):
-                self._has_win_bytes = True
+
+    def _create_high_byte_probers(self) -> List[CharSetProber]:
+        encoding_filter = self.encoding_filter
+        probers: List[CharSetProber] = [
+            MBCSGroupProber(self.lang_filter, encoding_filter, self.codec_prescreen)
+        ]
+        # If we're checking non-CJK encodings, use single-byte prober
+        if self.lang_filter & ~LanguageFilter.CJK:
+            probers.append(SBCSGroupProber(self.lang_filter, encoding_filter))
+        probers.append(WesternGroupProber(encoding_filter))
+        # Leave out groups that the filter left empty
+        return [
+            prober
+            for prober in probers
+            if not isinstance(prober, CharSetGroupProber) or prober.probers
+        ]
 
     def close(self) -> ResultDict:
         """
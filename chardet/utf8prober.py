@@ -24,7 +24,9 @@
 # <https://www.gnu.org/licenses/>.
 ######################### END LICENSE BLOCK #########################
 
-from typing import Union
+import codecs
+import re
+from typing import List, Optional, Union
 
 from .charsetprober import CharSetProber
 from .codingstatemachine import CodingStateMachine
@@ -34,17 +36,33 @@ from .mbcssm import UTF8_SM_MODEL
 
 class UTF8Prober(CharSetProber):
     ONE_CHAR_PROB = 0.5
+    # What Python's UTF-8 decoder accepts but our state machine does not: SO,
+    # SI and ESC, and the four-byte characters from U+10000 to U+1FFFF
+    SM_ONLY_ERRORS = re.compile(b"[\x0e\x0f\x1b]|\xf0[\x90-\x9f]")
+    # Every byte that does not start a multi-byte character
+    NON_LEAD_BYTES = bytes(range(0xC0))
 
     def __init__(self) -> None:
         super().__init__()
         self.coding_sm = CodingStateMachine(UTF8_SM_MODEL)
         self._num_mb_chars = 0
+        # Used by feed_fast, and only while it holds the same partial
+        # character (if any) as coding_sm
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._decoder_in_sync = True
         self.reset()
 
     def reset(self) -> None:
         super().reset()
         self.coding_sm.reset()
         self._num_mb_chars = 0
+        self._decoder.reset()
+        self._decoder_in_sync = True
+
+    def resync(self) -> None:
+        self.coding_sm.reset()
+        self._decoder.reset()
+        self._decoder_in_sync = True
 
     @property
     def charset_name(self) -> str:
@@ -54,25 +72,99 @@ class UTF8Prober(CharSetProber):
     def language(self) -> str:
         return ""
 
-    def feed(self, byte_str: Union[bytes, bytearray]) -> ProbingState:
-        for c in byte_str:
-            coding_state = self.coding_sm.next_state(c)
-            if coding_state == MachineState.ERROR:
+    def feed(self, byte_str: Union[bytes, bytearray, memoryview]) -> ProbingState:
+        state = self.feed_fast(byte_str)
+        if state is not None:
+            return state
+        char_ends: List[int] = []
+        char_lens: List[int] = []
+        stop = self.coding_sm.run(byte_str, char_ends, char_lens)
+        return self.feed_chars(byte_str, stop, char_ends, char_lens)
+
+    def feed_fast(
+        self, byte_str: Union[bytes, bytearray, memoryview]
+    ) -> Optional[ProbingState]:
+        """
+        Does all of ``feed`` with Python's UTF-8 decoder, which checks the
+        whole chunk in C, instead of with ``coding_sm``.  This only works if
+        the chunk is valid UTF-8 that the state machine accepts too, so if it
+        is not, nothing is changed and ``None`` is returned.
+        """
+        if not self._decoder_in_sync:
+            return None
+        pending = self._decoder.getstate()[0]
+        try:
+            # This takes a memoryview as it is, and leaves the decoder as it
+            # was if it fails
+            self._decoder.decode(byte_str)
+        except UnicodeDecodeError:
+            # coding_sm has to do it, and feed_chars resyncs the decoder
+            return None
+        # The checks below need bytes methods, which run in C and are much
+        # quicker than a regex over a memoryview.  Only chunks that are valid
+        # UTF-8 get this far, so most of those in other encodings are never
+        # copied.
+        byte_str = bytes(byte_str)
+        if self._has_sm_only_errors(byte_str) or (
+            pending and self._has_sm_only_errors(pending + byte_str[:1])
+        ):
+            self._decoder.setstate((pending, 0))
+            return None
+        new_pending = self._decoder.getstate()[0]
+        # Every character that starts with a lead byte is a multi-byte one,
+        # but the last one only counts once it is complete
+        num_leads = len(byte_str.translate(None, self.NON_LEAD_BYTES))
+        self._num_mb_chars += num_leads + bool(pending) - bool(new_pending)
+        # Leave coding_sm in the middle of the same character as the decoder
+        self.coding_sm.reset()
+        if new_pending:
+            self.coding_sm.run(new_pending, [], [])
+            # The decoder lets some bad starts of characters (like those of
+            # surrogates) through until they are complete
+            if self.coding_sm.state == MachineState.ERROR:
                 self._state = ProbingState.NOT_ME
-                break
-            if coding_state == MachineState.ITS_ME:
+        self._check_confidence()
+        return self.state
+
+    @classmethod
+    def _has_sm_only_errors(cls, byte_str: bytes) -> bool:
+        # Searching for single bytes is much faster than the regex
+        return (
+            b"\x0e" in byte_str
+            or b"\x0f" in byte_str
+            or b"\x1b" in byte_str
+            or (b"\xf0" in byte_str and bool(cls.SM_ONLY_ERRORS.search(byte_str)))
+        )
+
+    def feed_chars(
+        self,
+        byte_str: Union[bytes, bytearray, memoryview],
+        stop: int,
+        char_ends: List[int],
+        char_lens: List[int],
+    ) -> ProbingState:
+        """
+        Does the rest of ``feed``, given what running ``coding_sm`` over
+        ``byte_str`` found (see ``MultiByteCharSetProber.feed_chars``).
+        """
+        if stop < len(byte_str):
+            if self.coding_sm.state == MachineState.ERROR:
+                self._state = ProbingState.NOT_ME
+            else:
                 self._state = ProbingState.FOUND_IT
-                break
-            if coding_state == MachineState.START:
-                if self.coding_sm.get_current_charlen() >= 2:
-                    self._num_mb_chars += 1
+        # Every character that is not a single byte is a multi-byte one
+        self._num_mb_chars += len(char_lens) - char_lens.count(1)
+        # The decoder can only pick up again between characters
+        self._decoder.reset()
+        self._decoder_in_sync = self.coding_sm.state == MachineState.START
+        self._check_confidence()
+        return self.state
 
+    def _check_confidence(self) -> None:
         if self.state == ProbingState.DETECTING:
             if self.get_confidence() > self.SHORTCUT_THRESHOLD:
                 self._state = ProbingState.FOUND_IT
 
-        return self.state
-
     def get_confidence(self) -> float:
         unlike = 0.99
         if self._num_mb_chars < 6:
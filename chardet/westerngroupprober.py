@@ -0,0 +1,71 @@
+######################## BEGIN LICENSE BLOCK ########################
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, see
+# <https://www.gnu.org/licenses/>.
+######################### END LICENSE BLOCK #########################
+
+from typing import List, Optional, Union
+
+from .charsetgroupprober import CharSetGroupProber
+from .charsetprober import CharSetProber
+from .encodingfilter import EncodingFilter
+from .enums import ProbingState
+from .latin1prober import Latin1Prober
+from .macromanprober import MacRomanProber
+from .sbcharsetprober import ByteHistogram
+from .textfilter import XMLTagFilter
+
+
+class WesternGroupProber(CharSetGroupProber):
+    """
+    Runs ``Latin1Prober`` and ``MacRomanProber`` over the same input.
+
+    Both of them remove XML tags and then only look at pairs of adjacent
+    bytes, so the tags are removed and the pairs counted once per chunk and
+    shared between them.
+    """
+
+    def __init__(self, encoding_filter: Optional[EncodingFilter] = None) -> None:
+        super().__init__()
+        self._tag_filter = XMLTagFilter()
+        # The histogram of the filtered chunk currently being fed
+        self._histogram: Optional[ByteHistogram] = None
+        probers: List[CharSetProber] = []
+        if encoding_filter is None or encoding_filter.allows("ISO-8859-1"):
+            probers.append(Latin1Prober())
+        if encoding_filter is None or encoding_filter.allows("MacRoman"):
+            probers.append(MacRomanProber())
+        self.probers = probers
+        self.reset()
+
+    def reset(self) -> None:
+        super().reset()
+        self._tag_filter.reset()
+
+    def resync(self) -> None:
+        super().resync()
+        self._tag_filter.reset()
+
+    def feed(self, byte_str: Union[bytes, bytearray, memoryview]) -> ProbingState:
+        try:
+            return super().feed(byte_str)
+        finally:
+            self._histogram = None
+
+    def _feed_prober(
+        self, prober: CharSetProber, byte_str: Union[bytes, bytearray, memoryview]
+    ) -> ProbingState:
+        assert isinstance(prober, (Latin1Prober, MacRomanProber))
+        if self._histogram is None:
+            self._histogram = ByteHistogram(self._tag_filter.filter(byte_str))
+        return prober.feed_histogram(self._histogram)
@@ -5,10 +5,16 @@ Run chardet on a bunch of documents and see that we get the correct encodings.
 :author: Ian Cordasco
 """
 
+import asyncio
 import codecs
+import itertools
+import mmap
+import re
+import subprocess
 import sys
 import textwrap
 from difflib import ndiff
+from importlib import import_module
 from os import listdir
 from os.path import dirname, isdir, join, realpath, relpath, splitext
 from pathlib import Path
@@ -25,10 +31,24 @@ except ImportError:
 import pytest  # type: ignore[reportMissingImports]
 
 import chardet
-from chardet import escsm, mbcssm
-from chardet.codingstatemachine import CodingStateMachine
-from chardet.enums import MachineState
+from chardet import escsm, freqtables, mbcssm, sbcsmodels
+from chardet.charsetprober import CharSetProber
+from chardet.codingstatemachine import CodingStateMachine, FusedCodingStateMachine
+from chardet.enums import LanguageFilter, MachineState, ProbingState
+from chardet.langhebrewmodel import WINDOWS_1255_HEBREW_MODEL
 from chardet.metadata.languages import LANGUAGES
+from chardet.sampling import Head, HeadMiddleTail, Strided
+from chardet.sbcharsetprober import (
+    ByteHistogram,
+    SingleByteCharSetModel,
+    SingleByteCharSetProber,
+    compact_model,
+)
+from chardet.textfilter import (
+    MAX_PENDING_LETTERS,
+    InternationalWordsFilter,
+    XMLTagFilter,
+)
 
 # TODO: Restore Hungarian encodings (iso-8859-2 and windows-1250) after we
 #       retrain model.
@@ -222,6 +242,335 @@ def test_coding_state_machine(state_machine_model):
                 raise Exception(error_message)
 
 
+@pytest.mark.parametrize(
+    "state_machine_model",
+    [mbcssm.UTF8_SM_MODEL, *STATE_MACHINE_MODELS],
+    ids=lambda model: model["name"],
+)
+def test_coding_state_machine_run_matches_next_state(state_machine_model):
+    encoding_name = state_machine_model["name"]
+    text = "Grüße, 日本語のテキスト, 한국어, 中文 ~{ 1+1=2 }~ é ü"
+    byte_str = codecs.encode(text, encoding_name, errors="ignore") + bytes(range(256))
+    stepped = CodingStateMachine(state_machine_model)
+    expected_ends = []
+    expected_lens = []
+    expected_stop = len(byte_str)
+    for i, byte in enumerate(byte_str):
+        state = stepped.next_state(byte)
+        if state in (MachineState.ERROR, MachineState.ITS_ME):
+            expected_stop = i
+            break
+        if state == MachineState.START:
+            expected_ends.append(i)
+            expected_lens.append(stepped.get_current_charlen())
+
+    # Splitting the input between calls must not make a difference
+    for split in (len(byte_str), 7, 1):
+        machine = CodingStateMachine(state_machine_model)
+        char_ends = []
+        char_lens = []
+        stop = len(byte_str)
+        for start in range(0, len(byte_str), split):
+            chunk_ends = []
+            stop = start + machine.run(
+                byte_str[start : start + split], chunk_ends, char_lens
+            )
+            char_ends.extend(start + end for end in chunk_ends)
+            if stop < min(start + split, len(byte_str)):
+                break
+        assert (stop, char_ends, char_lens) == (
+            expected_stop,
+            expected_ends,
+            expected_lens,
+        )
+        assert machine.state == stepped.state
+
+
+@pytest.mark.parametrize(
+    "state_machine_model",
+    [mbcssm.UTF8_SM_MODEL, *STATE_MACHINE_MODELS],
+    ids=lambda model: model["name"],
+)
+def test_coding_state_machine_skips_start_runs(state_machine_model):
+    # Text with an escape or shift sequence (or a stray part of one) in it
+    for sequence in (
+        b"",
+        b"\x1b$B",
+        b"\x1b$)C\x0e",
+        b"~{ab~}",
+        b"~{",
+        b"\x00",
+        b"\xe9",
+    ):
+        byte_str = b"plain text " * 20 + sequence + b" more text" * 20
+        for split in (len(byte_str), 65, 7):
+            skipping = CodingStateMachine(state_machine_model)
+            stepping = CodingStateMachine(state_machine_model)
+            for start in range(0, len(byte_str), split):
+                chunk = byte_str[start : start + split]
+                stop = skipping.run(chunk, skip_start_runs=True)
+                assert stop == stepping.run(chunk)
+                assert skipping.state == stepping.state
+                if stop < len(chunk):
+                    break
+
+
+def test_fused_coding_state_machine_matches_run():
+    models = [
+        mbcssm.UTF8_SM_MODEL,
+        mbcssm.SJIS_SM_MODEL,
+        mbcssm.EUCJP_SM_MODEL,
+        mbcssm.GB2312_SM_MODEL,
+        mbcssm.BIG5_SM_MODEL,
+    ]
+    text = "Grüße, 日本語のテキスト, 中文 é ü"
+    for encoding_name in ("utf-8", "shift_jis", "euc_jp", "gb2312", "big5"):
+        byte_str = codecs.encode(text, encoding_name, errors="ignore") * 3
+        for split in (len(byte_str), 7, 1):
+            machines = [CodingStateMachine(model) for model in models]
+            fused_machines = [CodingStateMachine(model) for model in models]
+            fused = FusedCodingStateMachine(models)
+            for start in range(0, len(byte_str), split):
+                chunk = byte_str[start : start + split]
+                expected = []
+                for machine in machines:
+                    char_ends, char_lens = [], []
+                    stop = machine.run(chunk, char_ends, char_lens)
+                    expected.append((stop, char_ends, char_lens))
+                assert fused.run(chunk, fused_machines) == expected
+            assert [m.state for m in fused_machines] == [m.state for m in machines]
+
+
+def test_fused_coding_state_machine_replaces_full_state_table():
+    models = [mbcssm.UTF8_SM_MODEL, mbcssm.SJIS_SM_MODEL, mbcssm.EUCJP_SM_MODEL]
+    byte_str = codecs.encode("日本語のテキスト ab\n", "euc_jp") * 5
+    machines = [CodingStateMachine(model) for model in models]
+    expected = []
+    for machine in machines:
+        char_ends, char_lens = [], []
+        stop = machine.run(byte_str, char_ends, char_lens)
+        expected.append((stop, char_ends, char_lens))
+    # Replace the table on every call
+    fused = FusedCodingStateMachine(models)
+    fused.MAX_STATES = 0
+    fused_machines = [CodingStateMachine(model) for model in models]
+    assert fused.run(byte_str, fused_machines) == expected
+    assert [m.state for m in fused_machines] == [m.state for m in machines]
+    # Fill the first 256 ids so the run's states no longer fit in a byte
+    fused = FusedCodingStateMachine(models)
+    fused.MAX_STATES = 1024
+    for k in range(256):
+        fused._table.get_state((100 + k,) * len(models))
+    fused_machines = [CodingStateMachine(model) for model in models]
+    assert fused.run(byte_str, fused_machines) == expected
+    assert [m.state for m in fused_machines] == [m.state for m in machines]
+
+
+def test_fused_coding_state_machine_skips_ascii_runs():
+    models = [mbcssm.UTF8_SM_MODEL, mbcssm.SJIS_SM_MODEL, mbcssm.BIG5_SM_MODEL]
+    text = '<p class="x">日本語 ab</p>\n<a href="#">中文</a> c\n'
+    for encoding_name in ("utf-8", "shift_jis", "big5"):
+        byte_str = codecs.encode(text, encoding_name, errors="ignore") * 3
+        for split in (len(byte_str), 7, 1):
+            machines = [CodingStateMachine(model) for model in models]
+            fused_machines = [CodingStateMachine(model) for model in models]
+            fused = FusedCodingStateMachine(models)
+            for start in range(0, len(byte_str), split):
+                chunk = byte_str[start : start + split]
+                expected = []
+                for machine in machines:
+                    char_ends, char_lens = [], []
+                    stop = machine.run(chunk, char_ends, char_lens)
+                    # Leave out single ASCII bytes that follow another one
+                    kept = [
+                        k
+                        for k, (end, char_len) in enumerate(zip(char_ends, char_lens))
+                        if not (
+                            k
+                            and char_len == char_lens[k - 1] == 1
+                            and char_ends[k - 1] == end - 1
+                            and chunk[end] < 0x80
+                            and chunk[end - 1] < 0x80
+                        )
+                    ]
+                    expected.append((
+                        stop,
+                        [char_ends[k] for k in kept],
+                        [char_lens[k] for k in kept],
+                    ))
+                assert (
+                    fused.run(chunk, fused_machines, skip_ascii_runs=True) == expected
+                )
+            assert [m.state for m in fused_machines] == [m.state for m in machines]
+
+
+def test_utf8_prober_fast_path_matches_state_machine():
+    # Valid UTF-8, then things only one of the decoder and the state machine
+    # accept: ESC, U+10000 to U+1FFFF, code points past U+10FFFF and a
+    # surrogate
+    texts = [
+        "Grüße, 日本語 " * 4,
+        "x\x1b" + "é" * 8,
+        "é" * 3 + "😀" + "é" * 5,
+        "é" * 8 + "\U00020000",
+    ]
+    byte_strs = [text.encode("utf-8") for text in texts]
+    byte_strs += [b"\xc3\xa9" * 3 + b"\xf5\x80\x80\x80", b"ab\xed\xa0\x80\xc3\xa9"]
+    for byte_str in byte_strs:
+        for split in (len(byte_str), 7, 2, 1):
+            fast = chardet.utf8prober.UTF8Prober()
+            slow = chardet.utf8prober.UTF8Prober()
+            for start in range(0, len(byte_str), split):
+                chunk = byte_str[start : start + split]
+                char_ends, char_lens = [], []
+                stop = slow.coding_sm.run(chunk, char_ends, char_lens)
+                assert fast.feed(chunk) == slow.feed_chars(
+                    chunk, stop, char_ends, char_lens
+                )
+                assert fast.get_confidence() == slow.get_confidence()
+                assert fast.coding_sm.state == slow.coding_sm.state
+                if fast.state != ProbingState.DETECTING:
+                    break
+
+
+class BytewiseUTF1632Prober(chardet.utf1632prober.UTF1632Prober):
+    """Checks one byte at a time, as UTF1632Prober used to"""
+
+    def feed(self, byte_str):
+        for c in byte_str:
+            mod4 = self.position % 4
+            self.quad[mod4] = c
+            if mod4 == 3:
+                if self._split_quad:
+                    self._split_quad = False
+                else:
+                    self.validate_utf32_characters(self.quad)
+                    self.validate_utf16_characters(self.quad[0:2])
+                    self.validate_utf16_characters(self.quad[2:4])
+            if c == 0:
+                self.zeros_at_mod[mod4] += 1
+            else:
+                self.nonzeros_at_mod[mod4] += 1
+            self.position += 1
+        return self.state
+
+    def skip(self, num_bytes):
+        # The quad each skipped byte is in cannot be checked, unless that byte
+        # was the last of it
+        for offset in range(num_bytes):
+            self._split_quad = (self.position + offset) % 4 != 3
+        self.position += num_bytes % 4
+        self.first_half_surrogate_pair_detected_16be = False
+        self.first_half_surrogate_pair_detected_16le = False
+
+
+def test_utf1632_prober_matches_bytewise_checks():
+    text = "Grüße 😀 日本語 \U00020000 "
+    byte_strs = [
+        text.encode(encoding) * 3
+        for encoding in ("utf-16-le", "utf-16-be", "utf-32-le", "utf-32-be")
+    ]
+    # Lone and misplaced surrogates, and code points past U+10FFFF
+    byte_strs += [
+        b"\x00\xd8\x41\x00" * 8,
+        b"\xdc\x00\x00\xdc" * 8,
+        b"\x00\x11\x00\x00\x00\x00\xd8\x00" * 8,
+    ]
+    for byte_str in byte_strs:
+        for split, gap in (
+            (len(byte_str), 0),
+            (7, 0),
+            (5, 3),
+            (6, 2),
+            (1, 1),
+            (4, 5),
+        ):
+            prober = chardet.utf1632prober.UTF1632Prober()
+            expected = BytewiseUTF1632Prober()
+            for start in range(0, len(byte_str), split + gap):
+                chunk = byte_str[start : start + split]
+                assert prober.feed(chunk) == expected.feed(chunk)
+                assert vars(prober) == vars(expected)
+                if gap:
+                    prober.skip(gap)
+                    expected.skip(gap)
+
+
+def bytewise_filter_international_words(buf):
+    """Filters one word at a time, as CharSetProber used to"""
+    filtered = bytearray()
+    for word in re.findall(b"[a-zA-Z]*[\x80-\xff]+[a-zA-Z]*[^a-zA-Z\x80-\xff]?", buf):
+        filtered.extend(word[:-1])
+        last_char = word[-1:]
+        if not last_char.isalpha() and last_char < b"\x80":
+            last_char = b" "
+        filtered.extend(last_char)
+    return filtered
+
+
+def bytewise_remove_xml_tags(buf):
+    """Looks for tags one byte at a time, as CharSetProber used to"""
+    filtered = bytearray()
+    in_tag = False
+    prev = 0
+    for curr, buf_char in enumerate(buf):
+        if buf_char == ord(">"):
+            prev = curr + 1
+            in_tag = False
+        elif buf_char == ord("<"):
+            if curr > prev and not in_tag:
+                filtered.extend(buf[prev:curr])
+                filtered.extend(b" ")
+            in_tag = True
+    if not in_tag:
+        filtered.extend(buf[prev:])
+    return filtered
+
+
+def test_text_filters_match_bytewise_filters():
+    # Every short string of tag delimiters, letters, international characters
+    # and markers
+    for length in range(6):
+        for chars in itertools.product(b"<>aZ\xe9 .", repeat=length):
+            buf = bytes(chars)
+            for func, expected in (
+                (
+                    CharSetProber.filter_international_words,
+                    bytewise_filter_international_words,
+                ),
+                (CharSetProber.remove_xml_tags, bytewise_remove_xml_tags),
+            ):
+                assert func(buf) == expected(buf)
+                assert func(memoryview(buf)) == expected(buf)
+
+
+def test_text_filters_carry_over_between_chunks():
+    # Every short string split in two in every possible way, except for text
+    # followed by a stray ">", which XMLTagFilter knowingly gets wrong
+    for length in range(5):
+        for chars in itertools.product(b"<>aZ\xe9 .", repeat=length):
+            buf = bytes(chars)
+            for text_filter, func in (
+                (InternationalWordsFilter(), CharSetProber.filter_international_words),
+                (XMLTagFilter(), CharSetProber.remove_xml_tags),
+            ):
+                if isinstance(text_filter, XMLTagFilter) and re.match(
+                    b"([^<>]*<[^>]*>)*[^<>]*>", buf
+                ):
+                    continue
+                expected = func(buf)
+                for split in range(length + 1):
+                    text_filter.reset()
+                    filtered = text_filter.filter(buf[:split])
+                    filtered += text_filter.filter(memoryview(buf)[split:])
+                    assert filtered == expected
+    # A long run of letters is not all held back, only the end of it
+    text_filter = InternationalWordsFilter()
+    for _ in range(100):
+        assert text_filter.filter(b"a" * 1000) == b""
+    assert text_filter.filter(b"\xe9 ") == b"a" * MAX_PENDING_LETTERS + b"\xe9 "
+
+
 if HAVE_HYPOTHESIS:
 
     class JustALengthIssue(Exception):
@@ -295,3 +644,320 @@ if HAVE_HYPOTHESIS:
             assert result["encoding"] == results[0]["encoding"]
         except Exception as exc:
             raise RuntimeError(f"{result} != {results}") from exc
+
+
+def test_large_input_stops_early():
+    with open("tests/windows-1251-russian/aif.ru.health.xml", "rb") as f:
+        input_bytes = f.read()
+    detector = chardet.UniversalDetector()
+    detector.feed(input_bytes * 100)
+    assert detector.done
+    assert detector.result["encoding"] == chardet.detect(input_bytes)["encoding"]
+    # The UTF-16/32 prober gives up after 4KB, so it should never have seen
+    # more than the first slice of the input.
+    utf1632_prober = detector._utf1632_prober
+    assert utf1632_prober is not None
+    assert utf1632_prober.position <= detector.MAX_SLICE_SIZE
+
+
+def test_large_input_is_sliced_at_last_line_break():
+    input_bytes = (b"x" * 79 + b"\n") * 10000
+    detector = chardet.UniversalDetector()
+    slices = list(detector._iter_slices(memoryview(input_bytes)))
+    assert b"".join(slices) == input_bytes
+    # Each slice but the last ends at the last line break that fits
+    expected_size = detector.MAX_SLICE_SIZE // 80 * 80
+    assert [len(s) for s in slices[:-1]] == [expected_size] * (len(slices) - 1)
+
+
+def test_import_leaves_out_optional_modules():
+    modules = ("chardet.aio", "chardet.batch", "chardet.cache", "concurrent.futures")
+    code = f"import sys, chardet; print([m for m in {modules!r} if m in sys.modules])"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    ).stdout
+    assert output.strip() == "[]"
+    assert chardet.detect_many.__module__ == "chardet.batch"
+
+
+def test_detect_accepts_buffers_without_copying():
+    file_name = "tests/EUC-JP/arclamp.jp.xml"
+    with open(file_name, "rb") as f:
+        input_bytes = f.read()
+        expected = chardet.detect(input_bytes)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            assert chardet.detect(mapped) == expected
+            assert chardet.detect_all(mapped) == chardet.detect_all(input_bytes)
+    assert chardet.detect(memoryview(input_bytes)) == expected
+    # Buffers that are not contiguous are copied instead
+    every_other = memoryview(input_bytes)[::2]
+    assert chardet.detect(every_other) == chardet.detect(every_other.tobytes())
+    assert chardet.Detector().detect(every_other) == chardet.detect(every_other)
+    with pytest.raises(TypeError):
+        chardet.detect(input_bytes.decode("euc-jp"))  # type: ignore[reportArgumentType]
+
+
+def test_single_byte_prober_chunk_boundaries():
+    with open("tests/windows-1255-hebrew/carshops.co.il.xml", "rb") as f:
+        input_bytes = f.read()
+    for is_reversed in (False, True):
+        whole = SingleByteCharSetProber(WINDOWS_1255_HEBREW_MODEL, is_reversed)
+        whole.feed_histogram(ByteHistogram(whole.prefilter(input_bytes)))
+        pieces = SingleByteCharSetProber(WINDOWS_1255_HEBREW_MODEL, is_reversed)
+        filtered = pieces.prefilter(input_bytes)
+        for start in range(0, len(filtered), 7):
+            pieces.feed_histogram(ByteHistogram(filtered[start : start + 7]))
+        # Words split between chunks have to be filtered as a whole too
+        raw_pieces = SingleByteCharSetProber(WINDOWS_1255_HEBREW_MODEL, is_reversed)
+        for start in range(0, len(input_bytes), 7):
+            raw_pieces.feed(input_bytes[start : start + 7])
+        for prober in (pieces, raw_pieces):
+            assert prober._seq_counters == whole._seq_counters
+            assert prober._total_seqs == whole._total_seqs
+            assert prober._freq_char == whole._freq_char
+            assert prober._total_char == whole._total_char
+
+
+def test_binary_tables_match_sources():
+    # If this fails, rerun build_binary_tables.py
+    for lang_path in Path("chardet").glob("lang*model.py"):
+        lang_mod = import_module(f"chardet.{lang_path.stem}")
+        for name, model in vars(lang_mod).items():
+            if isinstance(model, SingleByteCharSetModel):
+                assert getattr(sbcsmodels, name) == compact_model(model), name
+    for module_name in ("big5freq", "euckrfreq", "euctwfreq", "gb2312freq", "jisfreq"):
+        freq_mod = import_module(f"chardet.{module_name}")
+        for name, value in vars(freq_mod).items():
+            if isinstance(value, tuple):
+                assert tuple(getattr(freqtables, name)) == value, name
+            elif name.isupper():
+                assert getattr(freqtables, name) == value, name
+    johab_mod = import_module("chardet.johabfreq")
+    assert freqtables.JOHAB_TO_EUCKR_ORDER_TABLE == johab_mod.JOHAB_TO_EUCKR_ORDER_TABLE
+    jpcntx_mod = import_module("chardet.jpcntxfreq")
+    size = freqtables.JP2_CHAR_CONTEXT_SIZE
+    assert [
+        tuple(freqtables.JP2_CHAR_CONTEXT[start : start + size])
+        for start in range(0, len(freqtables.JP2_CHAR_CONTEXT), size)
+    ] == list(jpcntx_mod.JP2_CHAR_CONTEXT)
+
+
+def test_detector_reuse_matches_detect():
+    file_names = [
+        "tests/CP932/y-moto.com.xml",
+        "tests/SHIFT_JIS/10e.org.xml",
+        "tests/UTF-32LE/plane1-utf-32le.html",
+        "tests/iso-2022-jp/_ude_1.txt",
+        "tests/windows-1255-hebrew/carshops.co.il.xml",
+        "tests/ascii/_chromium_iso-8859-1_with_no_encoding_specified.html",
+    ]
+    detector = chardet.Detector()
+    for file_name in file_names * 2:
+        with open(file_name, "rb") as f:
+            input_bytes = f.read()
+        assert detector.detect(input_bytes) == chardet.detect(input_bytes)
+        assert detector.detect_all(
+            input_bytes, ignore_threshold=True
+        ) == chardet.detect_all(input_bytes, ignore_threshold=True)
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_detect_files_matches_detect(ordered):
+    file_names = [str(path) for path in sorted(Path("tests/EUC-JP").iterdir())[:6]]
+    expected = {}
+    for file_name in file_names:
+        with open(file_name, "rb") as f:
+            expected[file_name] = chardet.detect(f.read())
+    results = list(
+        chardet.detect_files(file_names, workers=2, ordered=ordered, chunksize=3)
+    )
+    assert dict(results) == expected
+    if ordered:
+        assert [file_name for file_name, _ in results] == file_names
+    byte_strs = [Path(file_name).read_bytes() for file_name in file_names]
+    results = list(chardet.detect_many(byte_strs, workers=2, ordered=ordered))
+    assert sorted(index for index, _ in results) == list(range(len(file_names)))
+    for index, result in results:
+        assert result == expected[file_names[index]]
+
+
+def test_detect_many_in_process_generators_do_not_share_options():
+    byte_strs = [
+        path.read_bytes() for path in sorted(Path("tests/iso-8859-1").iterdir())[:3]
+    ]
+    renamed = chardet.detect_many(
+        byte_strs, workers=1, chunksize=1, should_rename_legacy=True
+    )
+    not_renamed = chardet.detect_many(
+        byte_strs, workers=1, chunksize=1, should_rename_legacy=False
+    )
+    for (_, renamed_result), (_, result) in zip(renamed, not_renamed):
+        assert renamed_result["encoding"] == "Windows-1252"
+        assert result["encoding"] == "ISO-8859-1"
+
+
+def test_adetect_stream_matches_detect():
+    file_name = "tests/windows-1251-russian/aif.ru.health.xml"
+    with open(file_name, "rb") as f:
+        input_bytes = f.read()
+    expected = chardet.detect(input_bytes)
+    chunks_read = []
+
+    async def body():
+        long_body = input_bytes * 100
+        for start in range(0, len(long_body), 1000):
+            chunks_read.append(start)
+            yield long_body[start : start + 1000]
+
+    async def from_reader():
+        reader = asyncio.StreamReader()
+        reader.feed_data(input_bytes)
+        reader.feed_eof()
+        return await chardet.adetect_stream(reader, offload=True)
+
+    result = asyncio.run(chardet.adetect_stream(body(), slice_size=300))
+    assert result["encoding"] == expected["encoding"]
+    # It should have stopped reading long before the end of the body
+    assert len(chunks_read) < len(input_bytes) * 100 // 1000
+    assert asyncio.run(from_reader()) == expected
+
+
+def test_detect_file(tmp_path):
+    file_name = "tests/windows-1251-russian/aif.ru.health.xml"
+    with open(file_name, "rb") as f:
+        input_bytes = f.read()
+    assert chardet.detect_file(file_name) == chardet.detect(input_bytes)
+    assert chardet.Detector().detect_file(file_name, block_size=1000) == (
+        chardet.detect(input_bytes)
+    )
+    big_file = tmp_path / "big.xml"
+    big_file.write_bytes(input_bytes * 1000)
+    expected_encoding = chardet.detect(input_bytes)["encoding"]
+    assert chardet.detect_file(big_file)["encoding"] == expected_encoding
+    empty_file = tmp_path / "empty.txt"
+    empty_file.write_bytes(b"")
+    assert chardet.detect_file(empty_file) == chardet.detect(b"")
+
+
+def test_encoding_filter_prunes_probers():
+    with open("tests/SHIFT_JIS/yasuhisa.com.xml", "rb") as f:
+        input_bytes = f.read()
+    assert chardet.detect(input_bytes, encodings=["shift_jis", "utf-8"]) == (
+        chardet.detect(input_bytes)
+    )
+    detector = chardet.UniversalDetector(encodings=["sjis", "utf_8", "windows-1252"])
+    detector.feed(input_bytes)
+    assert detector.close()["encoding"] == "SHIFT_JIS"
+    # ISO-8859-1 is kept, since the detector may rename it to Windows-1252
+    assert [type(p).__name__ for p in detector.charset_probers] == [
+        "MBCSGroupProber",
+        "WesternGroupProber",
+    ]
+    assert len(detector.charset_probers[0].probers) == 2
+    assert [type(p).__name__ for p in detector.charset_probers[1].probers] == [
+        "Latin1Prober"
+    ]
+    excluded = chardet.detect(input_bytes, exclude_encodings=["shift_jis", "cp932"])
+    assert excluded["encoding"] != "SHIFT_JIS"
+    # A BOM is still trusted
+    assert chardet.detect(codecs.BOM_UTF8 + input_bytes, encodings=["ascii"]) == (
+        chardet.detect(codecs.BOM_UTF8 + input_bytes)
+    )
+
+
+def test_language_filter_prunes_single_byte_probers():
+    file_name = "tests/iso-8859-7-greek/disabled.gr.xml"
+    with open(file_name, "rb") as f:
+        input_bytes = f.read()
+    detector = chardet.Detector(lang_filter=LanguageFilter.GREEK)
+    assert detector.detect(input_bytes) == chardet.detect(input_bytes)
+    sbcs_group = detector._detector.charset_probers[1]
+    assert {prober.language for prober in sbcs_group.probers} == {"Greek"}
+    detector = chardet.Detector(lang_filter=LanguageFilter.CYRILLIC)
+    detector.detect(input_bytes)
+    sbcs_group = detector._detector.charset_probers[1]
+    assert {prober.language for prober in sbcs_group.probers} == {
+        "Russian",
+        "Bulgarian",
+    }
+    # Every single-byte model has a flag, named after its language
+    for prober in chardet.sbcsgroupprober.SBCSGroupProber().probers:
+        assert LanguageFilter.for_language(prober.language).name == (
+            prober.language.upper()
+        )
+    # Filters saved as ints before there were per-language flags still allow
+    # every single-byte model
+    with open("tests/windows-1251-russian/aif.ru.health.xml", "rb") as f:
+        input_bytes = f.read()
+    assert LanguageFilter(0x1F) == LanguageFilter.ALL
+    detector = chardet.Detector(lang_filter=LanguageFilter(0x10))
+    assert detector.detect(input_bytes)["encoding"] == "windows-1251"
+
+
+def test_codec_prescreen_rules_out_multi_byte_probers():
+    with open("tests/SHIFT_JIS/yasuhisa.com.xml", "rb") as f:
+        input_bytes = f.read()
+    detector = chardet.Detector(codec_prescreen=True)
+    assert detector.detect(input_bytes) == chardet.detect(input_bytes)
+    mbcs_group = chardet.mbcsgroupprober.MBCSGroupProber(codec_prescreen=True)
+    mbcs_group.feed("日本語のテキスト".encode("shift_jis"))
+    # Not valid UTF-8, so that prober is ruled out without being fed
+    utf8_prober = mbcs_group.probers[0]
+    assert not utf8_prober.active
+    assert utf8_prober.state == ProbingState.NOT_ME
+    mbcs_group.reset()
+    assert all(prober.active for prober in mbcs_group.probers)
+    assert utf8_prober.state == ProbingState.DETECTING
+
+
+def test_result_cache():
+    with open("tests/SHIFT_JIS/yasuhisa.com.xml", "rb") as f:
+        input_bytes = f.read()
+    cache = chardet.ResultCache(maxsize=2)
+    result = chardet.detect(input_bytes, cache=cache)
+    assert result == chardet.detect(input_bytes)
+    result["encoding"] = None
+    assert chardet.detect(bytearray(input_bytes), cache=cache) == (
+        chardet.detect(input_bytes)
+    )
+    assert cache.cache_info() == (1, 1, 2, 1)
+    # Different options are cached separately
+    chardet.detect(input_bytes, should_rename_legacy=True, cache=cache)
+    assert chardet.detect_all(input_bytes, cache=cache) == (
+        chardet.detect_all(input_bytes)
+    )
+    assert cache.cache_info() == (1, 3, 2, 2)
+    # The plain detect result was the least recently used, so it was dropped
+    chardet.detect(input_bytes, cache=cache)
+    assert cache.cache_info() == (1, 4, 2, 2)
+    cache.clear()
+    assert cache.cache_info() == (0, 0, 2, 0)
+
+
+@pytest.mark.parametrize(
+    "file_name",
+    [
+        "tests/utf-8/_ude_greek.txt",
+        "tests/SHIFT_JIS/yasuhisa.com.xml",
+        "tests/EUC-JP/aivy.co.jp.xml",
+        "tests/UTF-16LE/nobom-utf16le.txt",
+        "tests/UTF-32BE/nobom-utf32be.txt",
+    ],
+)
+def test_sampling_resyncs_at_gaps(file_name, tmp_path):
+    with open(file_name, "rb") as f:
+        input_bytes = f.read()
+    expected = chardet.detect(input_bytes)["encoding"]
+    # Odd block sizes, so that most blocks start in the middle of a character
+    for sampling in (Strided(101, 60), HeadMiddleTail(999)):
+        result = chardet.detect(input_bytes * 20, sampling=sampling)
+        assert result["encoding"] == expected
+        big_file = tmp_path / "big"
+        big_file.write_bytes(input_bytes * 20)
+        assert chardet.detect_file(big_file, sampling=sampling) == result
+
+
+def test_head_sampling_ignores_the_rest():
+    input_bytes = b"a" * 1000 + "é".encode("utf-8") * 100
+    assert chardet.detect(input_bytes, sampling=Head(1000))["encoding"] == "ascii"
+    assert chardet.detect(input_bytes, sampling=Head(1001))["encoding"] != "ascii"